@@ -10,10 +10,30 @@
 4. 输出检测结果到 result.txt
 """
 
+import argparse
+import collections
+import csv
+import functools
+import hashlib
+import itertools
+import json
+import marshal
+import multiprocessing
+import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from common import batch_io
+except ImportError:
+    # 直接运行脚本时 Sec_tool 根目录不在 sys.path 上，公共模块位于 Sec_tool/common
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from common import batch_io
+from common.batch_io import DEFAULT_DEDUP_SIZE, DEFAULT_PROGRESS_INTERVAL, ProgressReporter, imap_ordered
+from luhn_kernel import BACKENDS as LUHN_BACKENDS, luhn_check_many, luhn_digits_ok
 
 
 # ==========================================================
@@ -59,9 +79,120 @@ def load_bins(bin_file: Path) -> List[Dict]:
         return []
 
 
+# ==========================================================
+# 编译缓存：避免每次启动都重新解析 TypeScript 文件
+# ==========================================================
+# 缓存格式版本号，缓存结构变化时递增即可让旧缓存自动失效
+TABLE_CACHE_VERSION = 1
+
+
+def _tables_digest(banks_file: Path, bin_file: Path) -> str:
+    """计算 banks.ts / bin.ts 内容的联合哈希，作为缓存键"""
+    h = hashlib.sha256()
+    for path in (banks_file, bin_file):
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _source_stamp(banks_file: Path, bin_file: Path) -> Optional[List[Tuple[int, int]]]:
+    """源文件的 (mtime_ns, size)，用于快速判断是否需要重新计算哈希；源文件不可访问时返回 None"""
+    stamp = []
+    for path in (banks_file, bin_file):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stamp.append((st.st_mtime_ns, st.st_size))
+    return stamp
+
+
+def load_tables(banks_file: Path, bin_file: Path, cache_file: Optional[Path] = None) -> Tuple[Dict[str, str], List[Dict], bool]:
+    """
+    加载银行表和 BIN 表，优先读取编译缓存
+
+    缓存为 marshal 格式，记录源文件的 mtime/大小及内容哈希：
+    - mtime 与大小均未变化：直接命中
+    - mtime 变化但内容哈希一致：命中并刷新 mtime 记录
+    - 否则重新解析 TypeScript 文件并重建缓存
+    - 源文件不可访问时不使用缓存，由 load_banks / load_bins 报错并返回空表
+
+    返回：(bank_dict, bin_list, 是否命中缓存)
+    """
+    start = time.perf_counter()
+    if cache_file is None:
+        cache_file = Path(banks_file).parent / ".bank_tables.cache"
+    cache_file = Path(cache_file)
+
+    stamp = _source_stamp(banks_file, bin_file)
+    cached = None
+    if stamp is None:
+        return load_banks(banks_file), load_bins(bin_file), False
+    try:
+        # 整块读入后再反序列化，比 marshal.load(f) 逐段读取快得多
+        cached = marshal.loads(cache_file.read_bytes())
+        if cached.get("version") != TABLE_CACHE_VERSION:
+            cached = None
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        cached = None
+
+    digest = None
+    hit = False
+    if cached is not None:
+        if [tuple(x) for x in cached["stamp"]] == stamp:
+            hit = True
+        else:
+            digest = _tables_digest(banks_file, bin_file)
+            hit = cached["digest"] == digest
+
+    if hit:
+        bank_dict = cached["banks"]
+        bin_list = [
+            {"bin": bin_code, "bank": bank, "type": card_type, "len": length}
+            for bin_code, bank, card_type, length in cached["bins"]
+        ]
+        print(f"[信息] 已加载 {len(bank_dict)} 个银行信息")
+        print(f"[信息] 已加载 {len(bin_list)} 个 BIN 码")
+    else:
+        bank_dict = load_banks(banks_file)
+        bin_list = load_bins(bin_file)
+
+    # 重建缓存（或仅刷新 mtime 记录）
+    if (not hit or digest is not None) and bank_dict and bin_list:
+        payload = {
+            "version": TABLE_CACHE_VERSION,
+            "stamp": stamp,
+            "digest": digest or _tables_digest(banks_file, bin_file),
+            "banks": bank_dict,
+            "bins": [(b["bin"], b["bank"], b["type"], b["len"]) for b in bin_list],
+        }
+        tmp_file = Path(f"{cache_file}.{os.getpid()}.tmp")
+        try:
+            tmp_file.write_bytes(marshal.dumps(payload))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"[警告] 写入数据缓存失败：{e}")
+
+    elapsed = (time.perf_counter() - start) * 1000
+    state = "缓存命中" if hit else "已重建缓存"
+    print(f"[信息] 数据加载耗时 {elapsed:.1f} ms（{state}）")
+    return bank_dict, bin_list, hit
+
+
 # ==========================================================
 # Luhn 校验算法
 # ==========================================================
+# 卡号清理：移除空格和横杠（预编译）
+_CLEAN_RE = re.compile(r"[\s-]")
+
+
+def clean_card_number(card_number: str) -> str:
+    """移除卡号中的空格和横杠；纯数字卡号直接返回，跳过正则替换"""
+    if card_number.isdigit():
+        return card_number
+    return _CLEAN_RE.sub("", card_number)
+
+
 def luhn_check(card_number: str) -> bool:
     """
     Luhn 算法校验银行卡号
@@ -73,53 +204,73 @@ def luhn_check(card_number: str) -> bool:
     4. 如果总和能被10整除，则卡号有效
     """
     # 移除空格和横杠
-    card_number = re.sub(r"[\s-]", "", card_number)
+    card_number = clean_card_number(card_number)
     
     if not card_number.isdigit():
         return False
     
-    # 从右到左处理
-    total = 0
-    reverse_digits = card_number[::-1]
-    
-    for i, digit in enumerate(reverse_digits):
-        num = int(digit)
-        if i % 2 == 1:  # 偶数位（从右数第2, 4, 6...位）
-            num *= 2
-            if num > 9:
-                num -= 9  # 等价于各位数字相加
-        total += num
-    
-    return total % 10 == 0
+    return luhn_digits_ok(card_number)
 
 
 # ==========================================================
 # BIN 匹配逻辑
 # ==========================================================
-def find_bin_match(card_number: str, bin_list: List[Dict]) -> Optional[Dict]:
+class BinIndex:
+    """
+    BIN 码索引（加载时构建一次）
+
+    以 (BIN 码, 卡号长度) 为键建立字典，查找时按 BIN 长度从长到短
+    逐一截取卡号前缀探测，每种 BIN 长度只探测一次（BIN 码最长 10 位，
+    因此最多 10 次字典查找）。
+    同一键出现多次时保留 bin.ts 中最先出现的记录，与原先
+    "稳定排序 + 顺序扫描" 的匹配结果完全一致。
+    """
+
+    __slots__ = ("table", "lengths")
+
+    def __init__(self, bin_list: List[Dict]):
+        self.table: Dict[Tuple[str, int], Dict] = {}
+        for bin_info in bin_list:
+            self.table.setdefault((bin_info["bin"], bin_info["len"]), bin_info)
+        # 按 BIN 长度降序排列，优先匹配更长的
+        self.lengths = sorted({len(b["bin"]) for b in bin_list}, reverse=True)
+
+    def match(self, cleaned: str) -> Optional[Dict]:
+        """对已清理的纯数字卡号做最长 BIN 匹配（同时要求卡号长度一致）"""
+        card_len = len(cleaned)
+        table = self.table
+        for bin_len in self.lengths:
+            if bin_len > card_len:
+                continue
+            bin_info = table.get((cleaned[:bin_len], card_len))
+            if bin_info is not None:
+                return bin_info
+        return None
+
+
+def build_bin_index(bin_list: List[Dict]) -> BinIndex:
+    """根据 load_bins 的结果构建 BIN 索引"""
+    return BinIndex(bin_list)
+
+
+def find_bin_match(card_number: str, bin_list: List[Dict], bin_index: Optional[BinIndex] = None) -> Optional[Dict]:
     """
     查找匹配的 BIN 码
     使用最长匹配原则：优先匹配更长的 BIN 码（支持最长10位BIN码）
+
+    bin_index 为预先构建的 BIN 索引；未提供时临时构建（批量检测请预先
+    调用 build_bin_index，避免每张卡重复构建）。
     """
     # 移除空格和横杠
-    card_number = re.sub(r"[\s-]", "", card_number)
+    card_number = clean_card_number(card_number)
     
     if not card_number.isdigit():
         return None
     
-    # 按 BIN 长度降序排序，优先匹配更长的（最长10位）
-    #优先匹配最长 BIN 可以保证匹配结果最精确。因此先排序再匹配。
-    sorted_bins = sorted(bin_list, key=lambda x: len(x["bin"]), reverse=True)
-    
-    # 尝试匹配（最长BIN码可达10位）
-    for bin_info in sorted_bins:
-        bin_code = bin_info["bin"]
-        if card_number.startswith(bin_code):
-            # 检查长度是否匹配
-            if len(card_number) == bin_info["len"]:
-                return bin_info
+    if bin_index is None:
+        bin_index = build_bin_index(bin_list)
     
-    return None
+    return bin_index.match(card_number)
 
 
 # ==========================================================
@@ -136,9 +287,104 @@ TYPE_MAP = {
 # ==========================================================
 # 主检测逻辑
 # ==========================================================
-def check_bank_card(card_number: str, bin_list: List[Dict], bank_dict: Dict[str, str]) -> Dict:
+class BankCardResult(NamedTuple):
+    """单张卡的检测结果（元组结构，比 5 键字典更省内存）"""
+    card_number: str
+    is_valid: bool
+    card_type: str
+    bank: str
+    reason: str
+
+
+class BankCardValidator:
+    """
+    可复用的银行卡检测器
+
+    持有 BIN 表、BIN 索引和银行名称表，每张卡只清理一次，
+    返回 BankCardResult。适合在服务中长期持有、反复调用。
+
+    luhn_backend 决定 check_many 批量校验 Luhn 时使用的后端（见 luhn_kernel）。
     """
-    检测银行卡号
+
+    __slots__ = ("bin_list", "bank_dict", "bin_index", "luhn_backend")
+
+    def __init__(self, bin_list: List[Dict], bank_dict: Dict[str, str],
+                 bin_index: Optional[BinIndex] = None, luhn_backend: str = "auto"):
+        if luhn_backend not in LUHN_BACKENDS:
+            raise ValueError(f"未知的 Luhn 后端：{luhn_backend}")
+        self.bin_list = bin_list
+        self.bank_dict = bank_dict
+        self.bin_index = bin_index if bin_index is not None else build_bin_index(bin_list)
+        self.luhn_backend = luhn_backend
+
+    @classmethod
+    def from_files(cls, banks_file: Path, bin_file: Path,
+                   cache_file: Optional[Path] = None) -> "BankCardValidator":
+        """从 banks.ts / bin.ts（或其缓存）构建检测器"""
+        bank_dict, bin_list, _ = load_tables(banks_file, bin_file, cache_file)
+        return cls(bin_list, bank_dict)
+
+    def check(self, card_number: str) -> BankCardResult:
+        """检测单个银行卡号"""
+        return self._check_cleaned(card_number, clean_card_number(card_number))
+
+    def _check_cleaned(self, card_number: str, cleaned: str,
+                       luhn_ok: Optional[bool] = None) -> BankCardResult:
+        """
+        检测已清理的卡号
+
+        luhn_ok 为批量预先计算的 Luhn 结果；为 None 时在此逐条计算
+        """
+        # 1. 长度和数字格式检查
+        if not cleaned.isdigit():
+            return BankCardResult(card_number, False, "", "", "格式错误：包含非数字字符")
+        
+        card_len = len(cleaned)
+        if card_len < 13 or card_len > 19:
+            return BankCardResult(card_number, False, "", "", f"长度错误：{card_len} 位（应为 13-19 位）")
+        
+        # 2. Luhn 校验
+        if luhn_ok is None:
+            luhn_ok = luhn_digits_ok(cleaned)
+        if not luhn_ok:
+            return BankCardResult(card_number, False, "", "", "Luhn 校验失败")
+        
+        # 3. BIN 检查
+        bin_match = self.bin_index.match(cleaned)
+        if not bin_match:
+            return BankCardResult(card_number, False, "", "", "BIN 码无效：前6位未匹配到合法BIN码")
+        
+        # 检查长度是否匹配
+        if card_len != bin_match["len"]:
+            return BankCardResult(card_number, False, "", "",
+                                  f"长度不匹配：BIN码要求 {bin_match['len']} 位，实际 {card_len} 位")
+        
+        # 获取银行名称和卡类型
+        bank_code = bin_match["bank"]
+        card_type_code = bin_match["type"]
+        return BankCardResult(
+            card_number,
+            True,
+            TYPE_MAP.get(card_type_code, card_type_code),
+            self.bank_dict.get(bank_code, bank_code),
+            "合法",
+        )
+
+    def check_many(self, card_numbers: Sequence[str]) -> List[BankCardResult]:
+        """批量检测：先按所选后端批量完成 Luhn 校验，再逐条检测其余规则"""
+        cleaned = [clean_card_number(c) for c in card_numbers]
+        luhn_mask = luhn_check_many(cleaned, self.luhn_backend)
+        check = self._check_cleaned
+        return [check(c, d, bool(ok)) for c, d, ok in zip(card_numbers, cleaned, luhn_mask)]
+
+
+def check_bank_card(card_number: str, bin_list: List[Dict], bank_dict: Dict[str, str],
+                    bin_index: Optional[BinIndex] = None) -> Dict:
+    """
+    检测银行卡号（BankCardValidator.check 的字典形式包装）
+    
+    bin_index: 预先构建的 BIN 索引（见 build_bin_index），批量检测时务必传入；
+    长期使用请直接持有 BankCardValidator
     
     返回：
     {
@@ -149,71 +395,325 @@ def check_bank_card(card_number: str, bin_list: List[Dict], bank_dict: Dict[str,
         "reason": 原因说明
     }
     """
-    result = {
-        "card_number": card_number,
-        "is_valid": False,
-        "card_type": "",
-        "bank": "",
-        "reason": ""
-    }
-    
-    # 清理卡号
-    cleaned = re.sub(r"[\s-]", "", card_number)
-    
-    # 1. 长度和数字格式检查
-    if not cleaned.isdigit():
-        result["reason"] = "格式错误：包含非数字字符"
-        return result
-    
-    if len(cleaned) < 13 or len(cleaned) > 19:
-        result["reason"] = f"长度错误：{len(cleaned)} 位（应为 13-19 位）"
-        return result
-    
-    # 2. Luhn 校验
-    if not luhn_check(cleaned):
-        result["reason"] = "Luhn 校验失败"
-        return result
-    
-    # 3. BIN 检查
-    bin_match = find_bin_match(cleaned, bin_list)
-    if not bin_match:
-        result["reason"] = "BIN 码无效：前6位未匹配到合法BIN码"
-        return result
-    
-    # 检查长度是否匹配
-    if len(cleaned) != bin_match["len"]:
-        result["reason"] = f"长度不匹配：BIN码要求 {bin_match['len']} 位，实际 {len(cleaned)} 位"
-        return result
-    
-    # 获取银行名称
-    bank_code = bin_match["bank"]
-    bank_name = bank_dict.get(bank_code, bank_code)
-    
-    # 获取卡类型
-    card_type_code = bin_match["type"]
-    card_type_name = TYPE_MAP.get(card_type_code, card_type_code)
-    
-    result.update({
-        "is_valid": True,
-        "card_type": card_type_name,
-        "bank": bank_name,
-        "reason": "合法"
-    })
-    
-    return result
+    return BankCardValidator(bin_list, bank_dict, bin_index).check(card_number)._asdict()
+
+
+# ==========================================================
+# 流式处理：分块读取、检测、写出
+# ==========================================================
+# 默认每块处理的卡号数量
+DEFAULT_CHUNK_SIZE = 10000
+# 结果文件写缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
+
+RESULT_HEADER = "卡号\t合法\t卡类型\t银行\n"
+
+
+def iter_card_chunks(input_file: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[str]]:
+    """逐块读取输入文件，每块最多 chunk_size 个卡号（跳过空行）"""
+    with open(input_file, "r", encoding="utf-8", errors="ignore") as f:
+        chunk = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# ==========================================================
+# 多进程分片检测
+# ==========================================================
+# 工作进程内的检测数据（由 _init_worker 在每个进程中初始化一次）
+_WORKER_STATE: Dict = {}
+
+
+def _init_worker(bin_list: List[Dict], bank_dict: Dict[str, str], luhn_backend: str = "auto"):
+    """工作进程初始化：构建检测器（含 BIN 索引）"""
+    _WORKER_STATE["validator"] = BankCardValidator(bin_list, bank_dict, luhn_backend=luhn_backend)
+
+
+def _worker_check_chunk(card_numbers: List[str]) -> List[BankCardResult]:
+    """工作进程中检测一块卡号"""
+    return _WORKER_STATE["validator"].check_many(card_numbers)
+
+
+def format_result_line(r: BankCardResult) -> str:
+    """把一条检测结果格式化为 result.txt 中的一行"""
+    return f"{r.card_number}\t{'是' if r.is_valid else '否'}\t{r.card_type}\t{r.bank}\n"
+
+
+def format_result_block(results: List[BankCardResult]) -> Tuple[str, int, int]:
+    """把一块检测结果格式化为 result.txt 中的文本，返回 (文本, 条数, 合法条数)"""
+    return "".join(format_result_line(r) for r in results), len(results), sum(1 for r in results if r.is_valid)
+
+
+def _worker_format_chunk(card_numbers: List[str]) -> Tuple[str, int, int]:
+    """工作进程中检测一块卡号并直接格式化为结果文本，主进程只负责写出"""
+    return format_result_block(_WORKER_STATE["validator"].check_many(card_numbers))
+
+
+def write_results(result_blocks: Iterable[Tuple[str, int, int]], output_file: Path,
+                  progress_interval: float = DEFAULT_PROGRESS_INTERVAL) -> Tuple[int, int]:
+    """
+    逐块写出 format_result_block 格式化好的结果文本（带大缓冲区），不在内存中保留全部结果
+
+    返回：(总条数, 合法条数)
+    """
+    total = 0
+    valid_count = 0
+    progress = ProgressReporter(progress_interval)
+    with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(RESULT_HEADER)
+        for text, count, valid in result_blocks:
+            f.write(text)
+            total += count
+            valid_count += valid
+            progress.update(count)
+    print(f"[信息] 处理速度：{progress.rate():.0f} 条/秒")
+    return total, valid_count
+
+
+# ==========================================================
+# 去重模式：重复出现的卡号只检测一次
+# ==========================================================
+class ResultCache(batch_io.ResultCache):
+    """规范化卡号（清理空格、横杠后）-> 检测结果 的 LRU 去重缓存，缓存值为结果中卡号以外的字段"""
+
+    normalize = staticmethod(clean_card_number)
+
+    @staticmethod
+    def to_value(r: BankCardResult) -> tuple:
+        return tuple(r[1:])
+
+    @staticmethod
+    def from_value(card: str, value: tuple) -> BankCardResult:
+        return BankCardResult(card, *value)
+
+
+# ==========================================================
+# CSV 列模式：直接检测大型 CSV 中的某一列
+# ==========================================================
+# 追加到原始行后的检测结果列
+CSV_RESULT_COLUMNS = ["is_valid", "bank", "card_type", "reason"]
+
+
+class CsvColumnReader:
+    """
+    分块读取 CSV 中指定列的卡号
+
+    value_chunks() 逐块产出该列的取值；keep_rows=True 时同时把原始行按块
+    暂存在 pending 中，供写出时与检测结果逐行拼接。暂存的块数受在途任务数
+    限制，内存占用与文件大小无关。
+    """
+
+    def __init__(self, input_file: Path, column: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 encoding: str = "utf-8-sig", delimiter: str = ","):
+        self.chunk_size = chunk_size
+        self.delimiter = delimiter
+        self.pending = collections.deque()
+        self._file = open(input_file, "r", encoding=encoding, errors="ignore", newline="")
+        self._reader = csv.reader(self._file, delimiter=delimiter)
+        self.header = next(self._reader, [])
+        if column not in self.header:
+            self.close()
+            raise ValueError(f"CSV 中不存在列 {column!r}，可用列：{', '.join(self.header)}")
+        self.index = self.header.index(column)
+
+    def value_chunks(self, keep_rows: bool = True) -> Iterator[List[str]]:
+        idx = self.index
+        rows = []
+        for row in self._reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) >= self.chunk_size:
+                yield self._take(rows, idx, keep_rows)
+                rows = []
+        if rows:
+            yield self._take(rows, idx, keep_rows)
+
+    def _take(self, rows: List[List[str]], idx: int, keep_rows: bool) -> List[str]:
+        if keep_rows:
+            self.pending.append(rows)
+        return [row[idx].strip() if idx < len(row) else "" for row in rows]
+
+    def close(self):
+        self._file.close()
+
+
+def write_csv_results(result_chunks: Iterable[List[BankCardResult]], source: CsvColumnReader,
+                      output_file: Path,
+                      progress_interval: float = DEFAULT_PROGRESS_INTERVAL) -> Tuple[int, int]:
+    """
+    把检测结果列追加到原始行后逐块写出
+
+    返回：(总条数, 合法条数)
+    """
+    total = 0
+    valid_count = 0
+    progress = ProgressReporter(progress_interval)
+    with open(output_file, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f, delimiter=source.delimiter)
+        writer.writerow(source.header + CSV_RESULT_COLUMNS)
+        for results in result_chunks:
+            rows = source.pending.popleft()
+            writer.writerows(
+                row + ["是" if r.is_valid else "否", r.bank, r.card_type, r.reason]
+                for row, r in zip(rows, results)
+            )
+            total += len(results)
+            valid_count += sum(1 for r in results if r.is_valid)
+            progress.update(len(results))
+    print(f"[信息] 处理速度：{progress.rate():.0f} 条/秒")
+    return total, valid_count
+
+
+# ==========================================================
+# 统计模式：单次流式聚合，不保留逐条结果
+# ==========================================================
+class CardStats:
+    """
+    按银行、卡类型、失败原因聚合计数
+
+    top_bins > 0 时额外统计卡号前 6 位（BIN 前缀）的出现次数，输出前 top_bins 个。
+    """
+
+    def __init__(self, top_bins: int = 0):
+        self.top_bins = top_bins
+        self.total = 0
+        self.valid = 0
+        self.by_bank = collections.Counter()
+        self.by_type = collections.Counter()
+        self.by_reason = collections.Counter()
+        self.by_prefix = collections.Counter()
+
+    def update(self, results: Iterable[BankCardResult]):
+        for r in results:
+            self.total += 1
+            if r.is_valid:
+                self.valid += 1
+                self.by_bank[r.bank] += 1
+                self.by_type[r.card_type] += 1
+            else:
+                self.by_reason[r.reason] += 1
+            if self.top_bins:
+                cleaned = clean_card_number(r.card_number)
+                if cleaned.isdigit():
+                    self.by_prefix[cleaned[:6]] += 1
+
+    def merge(self, other: "CardStats"):
+        """合并另一份（如工作进程返回的）分块统计"""
+        self.total += other.total
+        self.valid += other.valid
+        self.by_bank.update(other.by_bank)
+        self.by_type.update(other.by_type)
+        self.by_reason.update(other.by_reason)
+        self.by_prefix.update(other.by_prefix)
+
+    def to_dict(self) -> Dict:
+        summary = {
+            "total": self.total,
+            "valid": self.valid,
+            "invalid": self.total - self.valid,
+            "by_bank": dict(self.by_bank.most_common()),
+            "by_card_type": dict(self.by_type.most_common()),
+            "by_reason": dict(self.by_reason.most_common()),
+        }
+        if self.top_bins:
+            summary["top_bin_prefixes"] = dict(self.by_prefix.most_common(self.top_bins))
+        return summary
+
+    def write(self, path: Path):
+        """写出汇总：.tsv 后缀输出为 "分类\t键\t计数"，其余输出 JSON"""
+        summary = self.to_dict()
+        if path.suffix.lower() == ".tsv":
+            lines = ["分类\t键\t计数"]
+            for key in ("total", "valid", "invalid"):
+                lines.append(f"summary\t{key}\t{summary[key]}")
+            for category in ("by_bank", "by_card_type", "by_reason", "top_bin_prefixes"):
+                for key, count in summary.get(category, {}).items():
+                    lines.append(f"{category}\t{key}\t{count}")
+            path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        else:
+            path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _chunk_stats(results: List[BankCardResult], top_bins: int = 0) -> CardStats:
+    """把一块检测结果聚合为分块统计"""
+    stats = CardStats(top_bins)
+    stats.update(results)
+    return stats
+
+
+def _worker_stats_chunk(card_numbers: List[str], top_bins: int = 0) -> CardStats:
+    """工作进程中检测一块卡号并直接聚合，只把计数传回主进程"""
+    return _chunk_stats(_WORKER_STATE["validator"].check_many(card_numbers), top_bins)
+
+
+def collect_stats(chunk_stats: Iterable[CardStats], stats: CardStats,
+                  progress_interval: float = DEFAULT_PROGRESS_INTERVAL) -> CardStats:
+    """逐块合并分块统计；逐条结果在各块内聚合后即丢弃"""
+    progress = ProgressReporter(progress_interval)
+    for partial in chunk_stats:
+        stats.merge(partial)
+        progress.update(partial.total)
+    print(f"[信息] 处理速度：{progress.rate():.0f} 条/秒")
+    return stats
 
 
 # ==========================================================
 # 主执行逻辑
 # ==========================================================
+def parse_args():
+    """命令行参数解析"""
+    base_dir = Path(__file__).parent
+    p = argparse.ArgumentParser(description="银行卡号检测")
+    p.add_argument("-i", "--input", default=str(base_dir / "bank_id.txt"),
+                   help="输入文件，每行一个银行卡号（默认 bank_id.txt）")
+    p.add_argument("-o", "--output", default=str(base_dir / "result.txt"),
+                   help="结果输出文件（默认 result.txt）")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help=f"每块处理的卡号数量（默认 {DEFAULT_CHUNK_SIZE}）")
+    p.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                   help=f"进度输出间隔秒数，0 表示不输出（默认 {DEFAULT_PROGRESS_INTERVAL:g}）")
+    p.add_argument("--workers", type=int, default=1,
+                   help="并行检测的进程数，1 表示单进程（默认 1）")
+    p.add_argument("--csv-column",
+                   help="CSV 列模式：输入为 CSV 文件，检测该列（按表头名称）并把结果列追加写出")
+    p.add_argument("--csv-delimiter", default=",", help="CSV 分隔符（默认 ,）")
+    p.add_argument("--csv-encoding", default="utf-8-sig", help="CSV 输入编码（默认 utf-8-sig）")
+    p.add_argument("--stats-only", action="store_true",
+                   help="只输出按银行/卡类型/失败原因聚合的统计，不写逐条结果")
+    p.add_argument("--stats-output", default=str(base_dir / "stats.json"),
+                   help="统计结果文件，.tsv 后缀输出 TSV，其余输出 JSON（默认 stats.json）")
+    p.add_argument("--top-bins", type=int, default=0,
+                   help="统计模式下额外输出出现最多的前 N 个 BIN 前缀（卡号前 6 位）")
+    p.add_argument("--dedup", action="store_true",
+                   help="去重模式：重复卡号只检测一次，结果取自 LRU 缓存")
+    p.add_argument("--dedup-size", type=int, default=DEFAULT_DEDUP_SIZE,
+                   help=f"去重缓存容量（条，默认 {DEFAULT_DEDUP_SIZE}）")
+    p.add_argument("--dedup-cache",
+                   help="去重缓存持久化文件（隐含 --dedup）；BIN/银行表未变化时复用上次的检测结果")
+    p.add_argument("--luhn-backend", choices=LUHN_BACKENDS, default="auto",
+                   help="批量 Luhn 校验后端：python / numpy / auto（默认 auto，按批量大小自动选择）")
+    return p.parse_args()
+
+
 def main():
     """主函数"""
+    args = parse_args()
+    
     # 文件路径
     base_dir = Path(__file__).parent
     banks_file = base_dir / "src" / "banks.ts"
     bin_file = base_dir / "src" / "bin.ts"
-    input_file = base_dir / "bank_id.txt"
-    output_file = base_dir / "result.txt"
+    input_file = Path(args.input)
+    output_file = Path(args.output)
     
     # 检查输入文件
     if not input_file.exists():
@@ -223,53 +723,107 @@ def main():
     
     # 加载数据
     print("[信息] 正在加载银行和 BIN 码数据...")
-    bank_dict = load_banks(banks_file)
-    bin_list = load_bins(bin_file)
+    bank_dict, bin_list, _ = load_tables(banks_file, bin_file)
     
     if not bank_dict or not bin_list:
         print("[错误] 数据加载失败，程序中止")
         sys.exit(1)
     
-    # 读取银行卡号
-    print(f"[信息] 正在读取银行卡号：{input_file}")
-    with open(input_file, "r", encoding="utf-8", errors="ignore") as f:
-        card_numbers = [line.strip() for line in f if line.strip()]
+    # 构建检测器（BIN 索引仅构建一次）
+    validator = BankCardValidator(bin_list, bank_dict, luhn_backend=args.luhn_backend)
     
-    if not card_numbers:
+    # 分块读取银行卡号（普通文本每行一个，或 CSV 中的指定列）
+    csv_source = None
+    if args.csv_column:
+        print(f"[信息] 正在读取 CSV 列 {args.csv_column!r}：{input_file}")
+        try:
+            csv_source = CsvColumnReader(input_file, args.csv_column, max(1, args.chunk_size),
+                                         args.csv_encoding, args.csv_delimiter)
+        except ValueError as e:
+            print(f"[错误] {e}")
+            sys.exit(1)
+        chunks = csv_source.value_chunks(keep_rows=not args.stats_only)
+    else:
+        print(f"[信息] 正在读取银行卡号：{input_file}")
+        chunks = iter_card_chunks(input_file, max(1, args.chunk_size))
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
         print("[错误] 输入文件为空")
         sys.exit(1)
     
-    print(f"[信息] 共读取 {len(card_numbers)} 个银行卡号")
+    # 流式检测：写出逐条结果，或只做统计
+    stats_file = Path(args.stats_output)
+    if args.stats_only:
+        print(f"[信息] 统计模式：正在检测并汇总至 {stats_file}")
+    else:
+        print(f"[信息] 正在检测并写入结果：{output_file}")
+    chunks = itertools.chain([first_chunk], chunks)
     
-    # 检测每个卡号
-    results = []
-    for card_number in card_numbers:
-        result = check_bank_card(card_number, bin_list, bank_dict)
-        results.append(result)
-        # 调试输出
-        print(f"检测: {card_number[:6]}**** -> {'合法' if result['is_valid'] else '不合法'}: {result['reason']}")
+    # 去重模式：主进程剔除重复卡号，只把首次出现的卡号交给检测
+    result_cache = None
+    dedup_cache_file = Path(args.dedup_cache) if args.dedup_cache else None
+    if args.dedup or dedup_cache_file is not None:
+        result_cache = ResultCache(args.dedup_size)
+        if dedup_cache_file is not None:
+            tables_digest = _tables_digest(banks_file, bin_file)
+            loaded = result_cache.load(dedup_cache_file, tables_digest)
+            print(f"[信息] 去重缓存：已载入 {loaded} 条历史结果")
+        chunks = result_cache.split_chunks(chunks)
     
-    # 写入结果
-    print(f"[信息] 正在写入结果：{output_file}")
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("卡号\t合法\t卡类型\t银行\n")
-        for r in results:
-            f.write(
-                f"{r['card_number']}\t"
-                f"{'是' if r['is_valid'] else '否'}\t"
-                f"{r['card_type']}\t"
-                f"{r['bank']}\n"
-            )
+    if args.stats_only and result_cache is None:
+        # 统计模式：每块检测后立即聚合为计数，多进程时由工作进程完成聚合
+        chunk_func = functools.partial(_worker_stats_chunk, top_bins=args.top_bins)
+    elif csv_source is None and result_cache is None:
+        # 文本输出：工作进程直接格式化结果文本，主进程只做写出
+        chunk_func = _worker_format_chunk
+    else:
+        chunk_func = _worker_check_chunk
+    pool = None
+    if args.workers > 1:
+        # 多进程：各进程只初始化一次检测数据，结果按输入顺序合并
+        print(f"[信息] 使用 {args.workers} 个进程并行检测")
+        pool = multiprocessing.Pool(args.workers, initializer=_init_worker,
+                                    initargs=(bin_list, bank_dict, args.luhn_backend))
+        chunk_results = imap_ordered(pool, chunk_func, chunks, args.workers * 4)
+    else:
+        # 单进程：在当前进程中复用同一套分块函数
+        _WORKER_STATE["validator"] = validator
+        chunk_results = map(chunk_func, chunks)
+    if result_cache is not None:
+        chunk_results = result_cache.join_results(chunk_results)
+        if args.stats_only:
+            chunk_results = (_chunk_stats(results, args.top_bins) for results in chunk_results)
+        elif csv_source is None:
+            chunk_results = map(format_result_block, chunk_results)
+    
+    try:
+        if args.stats_only:
+            stats = collect_stats(chunk_results, CardStats(args.top_bins), args.progress_interval)
+            stats.write(stats_file)
+            total, valid_count = stats.total, stats.valid
+        elif csv_source is not None:
+            total, valid_count = write_csv_results(chunk_results, csv_source, output_file,
+                                                   args.progress_interval)
+        else:
+            total, valid_count = write_results(chunk_results, output_file, args.progress_interval)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if csv_source is not None:
+            csv_source.close()
+    if dedup_cache_file is not None:
+        result_cache.save(dedup_cache_file, tables_digest)
     
     # 统计
-    valid_count = sum(1 for r in results if r['is_valid'])
     print(f"[完成] 检测完成！")
-    print(f"    - 总计：{len(results)} 条")
+    print(f"    - 总计：{total} 条")
     print(f"    - 合法：{valid_count} 条")
-    print(f"    - 不合法：{len(results) - valid_count} 条")
-    print(f"    - 结果已保存至：{output_file}")
+    print(f"    - 不合法：{total - valid_count} 条")
+    if result_cache is not None:
+        print(f"    - 去重：{result_cache.summary()}")
+    print(f"    - 结果已保存至：{stats_file if args.stats_only else output_file}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+银行卡号检测性能基准
+-----------------------------------------
+功能：
+1. 根据 src/bin.ts 生成可复现的合成卡号语料（固定随机种子）：
+   每个 BIN / 长度的合法卡号，并按比例混入 Luhn 失败、长度错误、未知 BIN
+2. 分阶段测量 luhn_check、luhn_check_batch、find_bin_match、check_bank_card、
+   BankCardValidator.check_many 以及端到端 bank_id.py 的吞吐量（条/秒）和峰值内存
+3. 结果输出为 JSON，便于跨版本对比
+
+每个阶段在独立的子进程中运行，峰值内存（RSS）互不干扰。
+
+用法：
+    python3 bench_bank_id.py                         # 默认规模 10k / 1M / 10M
+    python3 bench_bank_id.py --sizes 10000 100000 -o bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import bank_id
+# 直接运行脚本时，导入 bank_id 已把 Sec_tool 根目录加入 sys.path
+from common.bench_utils import numpy_available, peak_rss_kb, run_stage_process, write_corpus
+
+BASE_DIR = Path(__file__).parent
+BANKS_FILE = BASE_DIR / "src" / "banks.ts"
+BIN_FILE = BASE_DIR / "src" / "bin.ts"
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+DEFAULT_SEED = 20240601
+
+# 语料中各类卡号的比例（其余为合法卡号）
+DEFAULT_MIX = {
+    "luhn_fail": 0.10,    # BIN 与长度正确，但校验位错误
+    "bad_length": 0.05,   # 长度不在 13-19 位之间
+    "unknown_bin": 0.10,  # Luhn 正确，但前缀不匹配任何 BIN
+}
+
+STAGES = ["luhn_check", "luhn_check_batch", "find_bin_match", "check_bank_card", "check_many", "main"]
+
+# 阶段内分块读取语料的大小
+CHUNK_SIZE = 10000
+
+
+# ==========================================================
+# 合成语料生成
+# ==========================================================
+def luhn_check_digit(partial: str) -> str:
+    """计算使 partial + 校验位 通过 Luhn 校验的校验位"""
+    total = 0
+    # partial 追加校验位后，partial 的最后一位成为"从右数第 2 位"，需要加倍
+    for i, digit in enumerate(reversed(partial)):
+        num = int(digit)
+        if i % 2 == 0:
+            num *= 2
+            if num > 9:
+                num -= 9
+        total += num
+    return str((10 - total % 10) % 10)
+
+
+def _random_digits(rnd: random.Random, n: int) -> str:
+    return "".join(rnd.choice("0123456789") for _ in range(n))
+
+
+def generate_corpus(size: int, bin_list: List[Dict], seed: int = DEFAULT_SEED,
+                    mix: Dict[str, float] = None) -> Iterator[str]:
+    """
+    生成 size 个合成卡号
+
+    合法卡号依次轮询每个 BIN（覆盖所有 BIN 与长度组合），其余按 mix 比例
+    生成各类失败样本。相同 seed 生成的语料完全一致。
+    """
+    mix = mix or DEFAULT_MIX
+    rnd = random.Random(seed)
+    index = bank_id.build_bin_index(bin_list)
+    bins = sorted(bin_list, key=lambda b: (b["bin"], b["len"]))
+    thresholds = []
+    acc = 0.0
+    for kind, share in mix.items():
+        acc += share
+        thresholds.append((acc, kind))
+
+    for n in range(size):
+        roll = rnd.random()
+        kind = next((k for t, k in thresholds if roll < t), "valid")
+        if kind == "bad_length":
+            length = rnd.choice([11, 12, 20, 21])
+            partial = _random_digits(rnd, length - 1)
+            yield partial + luhn_check_digit(partial)
+        elif kind == "unknown_bin":
+            while True:
+                length = rnd.randint(13, 19)
+                partial = _random_digits(rnd, length - 1)
+                card = partial + luhn_check_digit(partial)
+                if index.match(card) is None:
+                    yield card
+                    break
+        else:
+            b = bins[n % len(bins)]
+            partial = b["bin"] + _random_digits(rnd, b["len"] - len(b["bin"]) - 1)
+            check = luhn_check_digit(partial)
+            if kind == "luhn_fail":
+                check = str((int(check) + rnd.randint(1, 9)) % 10)
+            yield partial + check
+
+
+def ensure_corpus(size: int, bin_list: List[Dict], seed: int, corpus_dir: Path) -> Path:
+    """生成（或复用已生成的）语料文件"""
+    path = corpus_dir / f"cards_{size}_{seed}.txt"
+    return write_corpus(path, generate_corpus(size, bin_list, seed))
+
+
+# ==========================================================
+# 各阶段
+# ==========================================================
+def _run_stage(stage: str, corpus: Path, queue) -> None:
+    """在子进程中执行一个阶段，并把耗时和峰值内存放入 queue"""
+    import contextlib
+    import io
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = bank_id.BankCardValidator.from_files(BANKS_FILE, BIN_FILE)
+
+    if stage == "main":
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [sys.executable, str(BASE_DIR / "bank_id.py"), "-i", str(corpus),
+                   "-o", str(Path(tmp) / "result.txt"), "--progress-interval", "0"]
+            start = time.perf_counter()
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - start
+        queue.put({"seconds": elapsed, "peak_rss_kb": peak_rss_kb(resource.RUSAGE_CHILDREN)})
+        return
+
+    if stage == "luhn_check":
+        def run(chunk):
+            for c in chunk:
+                bank_id.luhn_check(c)
+    elif stage == "luhn_check_batch":
+        from luhn_kernel import luhn_check_batch
+
+        def run(chunk):
+            luhn_check_batch(chunk)
+    elif stage == "find_bin_match":
+        bin_list, bin_index = validator.bin_list, validator.bin_index
+
+        def run(chunk):
+            for c in chunk:
+                bank_id.find_bin_match(c, bin_list, bin_index)
+    elif stage == "check_bank_card":
+        bin_list, bank_dict, bin_index = validator.bin_list, validator.bank_dict, validator.bin_index
+
+        def run(chunk):
+            for c in chunk:
+                bank_id.check_bank_card(c, bin_list, bank_dict, bin_index)
+    elif stage == "check_many":
+        def run(chunk):
+            validator.check_many(chunk)
+    else:
+        raise ValueError(f"未知阶段：{stage}")
+
+    start = time.perf_counter()
+    for chunk in bank_id.iter_card_chunks(corpus, CHUNK_SIZE):
+        run(chunk)
+    elapsed = time.perf_counter() - start
+    queue.put({"seconds": elapsed, "peak_rss_kb": peak_rss_kb()})
+
+
+def run_stage(stage: str, corpus: Path) -> Dict:
+    """在独立子进程中运行阶段；子进程异常退出时抛出 RuntimeError"""
+    return run_stage_process(stage, _run_stage, stage, corpus)
+
+
+# ==========================================================
+# 主执行逻辑
+# ==========================================================
+def parse_args():
+    p = argparse.ArgumentParser(description="银行卡号检测性能基准")
+    p.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                   help="语料规模（默认 10000 1000000 10000000）")
+    p.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="要测量的阶段")
+    p.add_argument("--seed", type=int, default=DEFAULT_SEED, help="语料随机种子")
+    p.add_argument("--corpus-dir", default=str(Path(tempfile.gettempdir()) / "bank_id_bench"),
+                   help="语料缓存目录（相同规模与种子的语料会复用）")
+    p.add_argument("-o", "--out", default="bench_bank_id.json", help="JSON 结果文件")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    bin_list = bank_id.load_bins(BIN_FILE)
+    corpus_dir = Path(args.corpus_dir)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+
+    stages = list(args.stages)
+    if "luhn_check_batch" in stages and not numpy_available():
+        print("[警告] 未安装 numpy，跳过 luhn_check_batch 阶段")
+        stages.remove("luhn_check_batch")
+
+    results = []
+    for size in args.sizes:
+        print(f"[信息] 准备语料：{size} 条")
+        corpus = ensure_corpus(size, bin_list, args.seed, corpus_dir)
+        for stage in stages:
+            try:
+                r = run_stage(stage, corpus)
+            except RuntimeError as e:
+                print(f"    - {stage:<18} [错误] {e}")
+                results.append({"stage": stage, "size": size, "error": str(e)})
+                continue
+            r.update({
+                "stage": stage,
+                "size": size,
+                "cards_per_sec": size / r["seconds"] if r["seconds"] > 0 else None,
+            })
+            results.append(r)
+            print(f"    - {stage:<18} {r['seconds']:9.3f} s  "
+                  f"{r['cards_per_sec']:>12,.0f} 条/秒  峰值 {r['peak_rss_kb'] / 1024:8.1f} MB")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "mix": DEFAULT_MIX,
+        },
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[完成] 基准结果已保存至：{args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bank_id 回归测试：BIN 索引与原先顺序扫描的匹配结果一致
+
+原先的 find_bin_match 把 bin_list 按 BIN 长度稳定降序排序后顺序扫描，
+取第一条前缀和卡号长度都匹配的记录；BinIndex 必须给出同一条记录
+（最长 BIN 优先，同一 (BIN, 长度) 重复时取 bin.ts 中最先出现的）。
+
+运行：python3 -m pytest test_bank_id.py
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+import bank_id
+
+BIN_FILE = Path(__file__).resolve().parent / "src" / "bin.ts"
+
+
+def linear_match(card_number, bin_list):
+    """原先的顺序扫描实现，作为基准"""
+    card_number = bank_id.clean_card_number(card_number)
+    if not card_number.isdigit():
+        return None
+    for bin_info in sorted(bin_list, key=lambda x: len(x["bin"]), reverse=True):
+        if card_number.startswith(bin_info["bin"]) and len(card_number) == bin_info["len"]:
+            return bin_info
+    return None
+
+
+def _bin(code, bank, length, card_type="DC"):
+    return {"bin": code, "bank": bank, "type": card_type, "len": length}
+
+
+# 人工构造的并列情况：同一 BIN 与长度出现多次、前缀嵌套、同 BIN 不同长度
+TIE_BINS = [
+    _bin("622848", "ABC", 19),
+    _bin("622848", "DUP", 19),
+    _bin("6228", "SHORT", 19),
+    _bin("62284801", "LONG", 19),
+    _bin("62284801", "LONG_DUP", 19),
+    _bin("622848", "ABC16", 16),
+    _bin("62284802", "OTHER", 16, "CC"),
+    _bin("62", "UNION", 16),
+]
+
+
+def _cards(bin_list, rng, per_bin=3):
+    """为每个 BIN 生成若干合适长度、偏长、偏短的卡号，外加随机号码和非法输入"""
+    cards = ["", "abc", "6228-4801 2345 6789 012", "62284801234567890x"]
+    for b in bin_list:
+        for length in (b["len"], b["len"] + 1, b["len"] - 1):
+            for _ in range(per_bin):
+                tail = max(0, length - len(b["bin"]))
+                cards.append(b["bin"] + "".join(rng.choice("0123456789") for _ in range(tail)))
+    for _ in range(500):
+        cards.append("".join(rng.choice("0123456789") for _ in range(rng.randint(12, 20))))
+    return cards
+
+
+@pytest.fixture(scope="module")
+def bin_list():
+    return bank_id.load_bins(BIN_FILE)
+
+
+def test_ties_match_linear_scan():
+    rng = random.Random(1)
+    index = bank_id.build_bin_index(TIE_BINS)
+    for card in _cards(TIE_BINS, rng):
+        assert bank_id.find_bin_match(card, TIE_BINS, index) is linear_match(card, TIE_BINS), card
+    # 最长 BIN 优先；同一 (BIN, 长度) 取最先出现的
+    assert index.match("6228480100000000000")["bank"] == "LONG"
+    assert index.match("6228480000000000000")["bank"] == "ABC"
+    assert index.match("6228490000000000000")["bank"] == "SHORT"
+    assert index.match("6228480200000000")["bank"] == "OTHER"
+    assert index.match("6228480300000000")["bank"] == "ABC16"
+    assert index.match("6299999999999999")["bank"] == "UNION"
+
+
+def test_bin_table_matches_linear_scan(bin_list):
+    assert bin_list
+    rng = random.Random(2)
+    index = bank_id.build_bin_index(bin_list)
+    hits = 0
+    for card in _cards(bin_list, rng, per_bin=1):
+        expected = linear_match(card, bin_list)
+        assert bank_id.find_bin_match(card, bin_list, index) is expected, card
+        assert bank_id.find_bin_match(card, bin_list) is expected, card
+        hits += expected is not None
+    assert hits >= len(bin_list)
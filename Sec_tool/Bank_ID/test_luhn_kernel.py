@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+luhn_kernel 回归测试：批量校验与逐条校验结果一致
+
+以 bank_id.luhn_check 为基准，覆盖非数字输入、空串、混合长度、
+全角数字，以及 python / numpy / auto 三种后端。
+
+运行：python3 -m pytest test_luhn_kernel.py
+"""
+
+import random
+import re
+
+import pytest
+
+import bank_id
+import luhn_kernel
+
+SAMPLES = [
+    "", " ", "-", "0", "00", "18", "49927398716", "49927398717",
+    "6222021111111111", "6216611234567890", "86011110001764441",
+    "4992 7398 716", "4992-7398-716", " 49927398716 ", "4992\t7398716",
+    "49927398716x", "x49927398716", "abcd", "4992_7398_716", "+49927398716",
+    "４９９２７３９８７１６", "４９９２７３９８７１７", "4992 ７３９８ 716",
+]
+
+
+def _corpus(count=3000, seed=1):
+    """随机混合长度（1~25 位）的卡号，约一半补成合法校验位，并掺入分隔符和杂质字符"""
+    rng = random.Random(seed)
+    cards = list(SAMPLES)
+    for _ in range(count):
+        body = "".join(rng.choice("0123456789") for _ in range(rng.randint(0, 24)))
+        digits = next(body + d for d in "0123456789" if luhn_kernel._luhn_scalar(body + d))
+        if rng.random() < 0.5:
+            digits = body + rng.choice("0123456789")
+        kind = rng.random()
+        if kind < 0.1:
+            digits = " ".join(digits[i:i + 4] for i in range(0, len(digits), 4))
+        elif kind < 0.15:
+            digits = digits.replace(digits[0], "-", 1)
+        elif kind < 0.2:
+            digits += rng.choice("xX.*/")
+        cards.append(digits)
+    return cards
+
+
+CARDS = _corpus()
+EXPECTED = [bank_id.luhn_check(c) for c in CARDS]
+
+
+def test_scalar_reference():
+    """bank_id.luhn_check 与清理后的逐位参考实现一致"""
+    assert EXPECTED == [luhn_kernel._luhn_scalar(re.sub(r"[\s-]", "", c)) for c in CARDS]
+    assert any(EXPECTED) and not all(EXPECTED)
+
+
+def test_python_backend():
+    assert list(luhn_kernel.luhn_check_many(CARDS, backend="python")) == EXPECTED
+    assert [luhn_kernel.luhn_check(c) for c in CARDS] == EXPECTED
+
+
+@pytest.mark.parametrize("backend", ["numpy", "auto"])
+def test_numpy_backend(backend):
+    pytest.importorskip("numpy")
+    assert list(luhn_kernel.luhn_check_many(CARDS, backend=backend)) == EXPECTED
+
+
+def test_batch_boundaries(monkeypatch):
+    """跨批次（BATCH_ROWS）切分时结果不变，含非 ASCII 行的批次也一样"""
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(luhn_kernel, "BATCH_ROWS", 7)
+    assert luhn_kernel.luhn_check_batch(CARDS).tolist() == EXPECTED
+    assert luhn_kernel.luhn_check_batch([]).tolist() == []
+    assert luhn_kernel.luhn_check_batch(["", ""]).tolist() == [False, False]
+
+
+def test_numpy_missing(monkeypatch):
+    """未安装 numpy 时：auto 回退到 python，显式 numpy 报错"""
+    monkeypatch.setattr(luhn_kernel, "np", None)
+    assert luhn_kernel.resolve_backend("auto", 10 ** 6) == "python"
+    assert list(luhn_kernel.luhn_check_many(CARDS, backend="auto")) == EXPECTED
+    with pytest.raises(ImportError):
+        luhn_kernel.luhn_check_many(CARDS, backend="numpy")
+    with pytest.raises(ValueError):
+        luhn_kernel.resolve_backend("simd", 1)
@@ -11,51 +11,328 @@
 5. 可命令行运行，也可作为模块使用
 """
 
-import sys
+import argparse
+import csv
+import hashlib
+import io
+import marshal
+import multiprocessing
+import os
 import re
-import pandas as pd
+import sys
+import time
+from array import array
 from datetime import datetime
+from pathlib import Path
+
+try:
+    from common import batch_io
+except ImportError:
+    # 直接运行脚本时 Sec_tool 根目录不在 sys.path 上，公共模块位于 Sec_tool/common
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from common import batch_io
+from common.batch_io import DEFAULT_DEDUP_SIZE, DEFAULT_PROGRESS_INTERVAL, ProgressReporter, imap_ordered
 
 # ==========================================================
 # 行政区码表加载
 # ==========================================================
-def load_region_codes(region_file_path):
+# 区码行格式：6 位区码 + 分隔符 + 名称
+REGION_LINE_PATTERN = r"^\s*(\d{6})[\s,，;、\t ]+(.+)$"
+_REGION_LINE_RE = re.compile(REGION_LINE_PATTERN)
+# CSV/TXT 区码表依次尝试的编码
+REGION_CSV_ENCODINGS = ["utf-8-sig", "utf-8", "gbk", "gb2312", "big5"]
+# 视为空值的单元格内容（与 pandas.read_csv 默认 na_values 相同）
+CSV_NA_VALUES = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+# 缓存格式版本号，缓存结构变化时递增即可让旧缓存自动失效
+REGION_CACHE_VERSION = 1
+
+
+def _region_cache_path(region_file_path):
+    """区码表缓存文件路径：与源文件同目录的 .<文件名>.cache"""
+    path = Path(region_file_path)
+    return path.with_name(f".{path.name}.cache")
+
+
+def _file_digest(path):
+    """源文件内容哈希，作为缓存键"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _load_region_cache(cache_path, digest):
+    """读取区码表缓存，哈希不一致或缓存损坏时返回 None"""
+    try:
+        cached = marshal.loads(Path(cache_path).read_bytes())
+        if cached.get("version") == REGION_CACHE_VERSION and cached.get("digest") == digest:
+            return cached
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _save_region_cache(cache_path, digest, region_dict, count):
+    """原子写入区码表缓存，写入失败只提示不中断"""
+    payload = {
+        "version": REGION_CACHE_VERSION,
+        "digest": digest,
+        "count": count,
+        "regions": region_dict,
+    }
+    tmp_path = Path(f"{cache_path}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(marshal.dumps(payload))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[警告] 写入行政区码表缓存失败：{e}")
+
+
+def _parse_region_frame(df):
+    """
+    按列向量化解析区码表（pandas DataFrame）
+
+    每行非空单元格以空格拼接后匹配 "区码 + 分隔符 + 名称"，
+    返回 (region_dict, 有效记录数)
+    """
+    line = None
+    has_value = None
+    for col in df.columns:
+        values = df[col]
+        present = values.notna()
+        text = values.where(present, "").astype(str)
+        if line is None:
+            line, has_value = text, present
+        else:
+            # 仅在前后都有值时插入空格，与逐行 " ".join(非空单元格) 完全一致
+            sep = (has_value & present).map({True: " ", False: ""})
+            line = line + sep + text
+            has_value = has_value | present
+
+    parts = line.str.strip().str.extract(REGION_LINE_PATTERN).dropna()
+    region_dict = dict(zip(parts[0], parts[1].str.strip()))
+    return region_dict, len(parts)
+
+
+def _read_region_csv(region_file_path):
+    """
+    用标准库读取 CSV/TXT 区码表，按编码列表依次尝试解码
+
+    返回非空行的字段列表；所有编码都无法解码时返回空列表
+    """
+    data = Path(region_file_path).read_bytes()
+    for enc in REGION_CSV_ENCODINGS:
+        try:
+            text = data.decode(enc)
+        except UnicodeDecodeError:
+            continue
+        print(f"[信息] 已识别为 CSV/TXT 格式，使用编码：{enc}")
+        return [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+    return []
+
+
+def _parse_region_rows(rows):
+    """
+    逐行解析 CSV 区码表，返回 (region_dict, 有效记录数)
+
+    空值判定与 pandas.read_csv 默认的 na_values 一致，结果与 pandas 路径相同
+    """
+    region_dict = {}
+    count = 0
+    for row in rows:
+        line = " ".join(v for v in row if v not in CSV_NA_VALUES).strip()
+        match = _REGION_LINE_RE.match(line)
+        if match:
+            code, name = match.groups()
+            region_dict[code] = name.strip()
+            count += 1
+    return region_dict, count
+
+
+def load_region_codes(region_file_path, use_cache=True):
+    """
+    加载行政区码表
+
+    解析结果以 marshal 格式缓存在源文件旁（.<文件名>.cache），按源文件内容哈希
+    判断是否有效；命中缓存时无需再读取 Excel/CSV。
+    pandas 只在解析 Excel 时才导入，CSV/TXT 与缓存均走标准库路径。
+    """
     region_dict = {}
     try:
-        # 自动识别 Excel
+        start = time.perf_counter()
+        digest = None
+        cache_path = _region_cache_path(region_file_path)
+        if use_cache:
+            digest = _file_digest(region_file_path)
+            cached = _load_region_cache(cache_path, digest)
+            if cached is not None:
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"[信息] 行政区码表加载完成：{cached['count']} 条有效记录"
+                      f"（缓存命中，{elapsed:.1f} ms）")
+                return cached["regions"]
+
+        # 自动识别 Excel（仅此时才需要 pandas）
         if region_file_path.lower().endswith((".xls", ".xlsx")):
+            import pandas as pd
             df = pd.read_excel(region_file_path, header=None, dtype=str)
             print(f"[信息] 已识别为 Excel 格式，加载中：{region_file_path}")
+            if df.empty:
+                raise ValueError("文件为空或无法解析")
+            region_dict, count = _parse_region_frame(df)
         else:
-            encodings = ["utf-8-sig", "utf-8", "gbk", "gb2312", "big5"]
-            for enc in encodings:
-                try:
-                    df = pd.read_csv(region_file_path, header=None, dtype=str, encoding=enc)
-                    print(f"[信息] 已识别为 CSV/TXT 格式，使用编码：{enc}")
-                    break
-                except Exception:
-                    continue
-        if df is None or df.empty:
-            raise ValueError("文件为空或无法解析")
-
-        count = 0
-        for _, row in df.iterrows():
-            line = " ".join(str(v) for v in row if pd.notna(v)).strip()
-            match = re.match(r"^\s*(\d{6})[\s,，;、\t ]+(.+)$", line)
-            if match:
-                code, name = match.groups()
-                region_dict[code] = name.strip()
-                count += 1
-
-        print(f"[信息] 行政区码表加载完成：{count} 条有效记录")
+            rows = _read_region_csv(region_file_path)
+            if not rows:
+                raise ValueError("文件为空或无法解析")
+            region_dict, count = _parse_region_rows(rows)
+        if use_cache and region_dict:
+            _save_region_cache(cache_path, digest, region_dict, count)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[信息] 行政区码表加载完成：{count} 条有效记录（{elapsed:.1f} ms）")
         return region_dict
     except Exception as e:
         print(f"[错误] 加载行政区码表失败：{e}")
         return {}
 
+
+# ==========================================================
+# 整数区码索引（支持多版本区码表）
+# ==========================================================
+# 6 位区码的取值空间
+REGION_CODE_SPACE = 1000000
+# 版本以位掩码记录，最多支持的版本数
+MAX_REGION_VERSIONS = 32
+
+
+class RegionIndex:
+    """
+    以整数区码为下标的稠密数组索引
+
+    - name_ids[code]：区码对应名称在 names 中的下标，-1 表示无此区码
+    - version_masks[code]：包含该区码的版本位掩码（第 i 位对应 versions[i]）
+
+    区县 -> 地市 -> 省 的回退只需 3 次数组访问（code、code//100*100、
+    code//10000*10000），不再拼接字符串。
+    可同时加载多个历史版本，按从旧到新的顺序加入，同一区码名称不同时以最新版本为准。
+    """
+
+    __slots__ = ("names", "name_ids", "version_masks", "versions", "_name_lookup", "_version_cache")
+
+    def __init__(self):
+        self.names = []
+        self.name_ids = array("i", [-1]) * REGION_CODE_SPACE
+        self.version_masks = array("I", [0]) * REGION_CODE_SPACE
+        self.versions = []
+        self._name_lookup = {}
+        self._version_cache = {}
+
+    @classmethod
+    def from_files(cls, region_file_paths, use_cache=True):
+        """按从旧到新的顺序加载多个区码表文件，版本名取文件名（不含后缀）"""
+        index = cls()
+        for path in region_file_paths:
+            region_dict = load_region_codes(str(path), use_cache=use_cache)
+            if not region_dict:
+                raise ValueError(f"未能从 {path} 加载任何行政区数据")
+            index.add_version(Path(path).stem, region_dict)
+        return index
+
+    def add_version(self, version, region_dict):
+        """加入一个版本的区码表（应晚于已加入的版本）"""
+        if len(self.versions) >= MAX_REGION_VERSIONS:
+            raise ValueError(f"区码表版本数超过上限 {MAX_REGION_VERSIONS}")
+        bit = 1 << len(self.versions)
+        self.versions.append(version)
+        self._version_cache.clear()
+        for code, name in region_dict.items():
+            code = int(code)
+            name_id = self._name_lookup.get(name)
+            if name_id is None:
+                name_id = self._name_lookup[name] = len(self.names)
+                self.names.append(name)
+            self.name_ids[code] = name_id
+            self.version_masks[code] |= bit
+
+    def __len__(self):
+        return REGION_CODE_SPACE - self.version_masks.count(0)
+
+    def _match(self, code):
+        """按区县 -> 地市 -> 省回退，返回命中的区码，未命中返回 -1"""
+        if isinstance(code, str):
+            # 与字典键的字符串匹配保持一致：全角等非 ASCII 数字不视为有效区码
+            if not (code.isascii() and code.isdigit() and len(code) == 6):
+                return -1
+            code = int(code)
+        elif not 0 <= code < REGION_CODE_SPACE:
+            return -1
+        name_ids = self.name_ids
+        if name_ids[code] >= 0:
+            return code
+        code = code // 100 * 100
+        if name_ids[code] >= 0:
+            return code
+        code = code // 10000 * 10000
+        return code if name_ids[code] >= 0 else -1
+
+    def resolve(self, code):
+        """区码（int 或 6 位字符串）对应的地区名称，未命中返回空字符串"""
+        matched = self._match(code)
+        return self.names[self.name_ids[matched]] if matched >= 0 else ""
+
+    def lookup(self, code):
+        """
+        查询区码，返回 (名称, 包含该区码的版本元组)
+
+        回退到地市、省级区码时，版本为命中的上级区码所在的版本；未命中返回 ("", ())
+        """
+        matched = self._match(code)
+        if matched < 0:
+            return "", ()
+        return self.names[self.name_ids[matched]], self.version_names(self.version_masks[matched])
+
+    def version_names(self, mask):
+        """把版本位掩码转换为版本名元组"""
+        names = self._version_cache.get(mask)
+        if names is None:
+            names = self._version_cache[mask] = tuple(
+                v for i, v in enumerate(self.versions) if mask >> i & 1)
+        return names
+
+
 # ==========================================================
 # 身份证号检测逻辑
 # ==========================================================
+# 各月天数（下标为月份，0 占位；闰年 2 月另加 1 天）
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_ID_CLEAN_RE = re.compile(r"[\s-]")
+# 合法年龄范围（岁）
+MIN_AGE, MAX_AGE = 0, 120
+
+# 计算年龄使用的当前年份，模块加载时取一次；长时间运行跨年时调用 refresh_current_year
+_current_year = datetime.now().year
+
+
+def refresh_current_year():
+    """重新读取当前年份，返回新的年份"""
+    global _current_year
+    _current_year = datetime.now().year
+    return _current_year
+
+
+def is_valid_date(year, month, day):
+    """公历日期是否存在（含闰年判断），与 strptime("%Y%m%d") 的接受范围一致"""
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return day <= 29
+    return day <= DAYS_IN_MONTH[month]
+
+
+def normalize_id(id_number):
+    """清理空格、横杠等并转为大写，作为检测与去重的规范形式"""
+    return _ID_CLEAN_RE.sub("", id_number).upper()
+
+
 def calc_check_digit(id17):
     """计算身份证校验位"""
     weight_factors = [7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2]
@@ -63,8 +340,14 @@ def calc_check_digit(id17):
     s = sum(int(a) * b for a, b in zip(id17, weight_factors))
     return check_map[s % 11]
 
-def check_id_card(id_number, region_dict):
-    """单条身份证号检测"""
+def check_id_card(id_number, region_dict, current_year=None):
+    """
+    单条身份证号检测
+
+    :param region_dict: load_region_codes 返回的区码字典，或 RegionIndex
+    :param current_year: 计算年龄使用的当前年份，默认取模块加载时（或最近一次
+                         refresh_current_year）的年份
+    """
     result = {
         "id": id_number,
         "is_valid": False,
@@ -75,7 +358,7 @@ def check_id_card(id_number, region_dict):
     }
 
     # 清理空格、横杠、不可见字符
-    id_number = re.sub(r"[\s-]", "", id_number).upper()
+    id_number = normalize_id(id_number)
 
     if not re.fullmatch(r"\d{15}|\d{17}[\dX]", id_number):
         result["reason"] = "格式错误"
@@ -87,14 +370,17 @@ def check_id_card(id_number, region_dict):
         id_number += calc_check_digit(id_number)
 
     # 区码
-    region_code = id_number[:6]
-    province_code = id_number[:2] + "0000"
-    city_code = id_number[:4] + "00"
-    region_name = (
-        region_dict.get(region_code)
-        or region_dict.get(city_code)
-        or region_dict.get(province_code)
-    )
+    if isinstance(region_dict, RegionIndex):
+        region_name = region_dict.resolve(id_number[:6]) if id_number.isascii() else ""
+    else:
+        region_code = id_number[:6]
+        province_code = id_number[:2] + "0000"
+        city_code = id_number[:4] + "00"
+        region_name = (
+            region_dict.get(region_code)
+            or region_dict.get(city_code)
+            or region_dict.get(province_code)
+        )
 
     # 区码无效判为不合法
     if not region_name:
@@ -102,19 +388,18 @@ def check_id_card(id_number, region_dict):
         result["region"] = "未知地区"
         return result
 
-    # 出生日期校验
-    try:
-        birth = id_number[6:14]
-        birth_date = datetime.strptime(birth, "%Y%m%d")
-        now = datetime.now()
-        age = now.year - birth_date.year
-        if not (0 <= age <= 120):
-            result["reason"] = "出生日期不合法"
-            return result
-        birthday = birth_date.strftime("%Y-%m-%d")
-    except Exception:
+    # 出生日期校验：整数运算，不再逐条调用 strptime / datetime.now()
+    year = int(id_number[6:10])
+    month = int(id_number[10:12])
+    day = int(id_number[12:14])
+    if not is_valid_date(year, month, day):
         result["reason"] = "出生日期格式错误"
         return result
+    age = (_current_year if current_year is None else current_year) - year
+    if not (MIN_AGE <= age <= MAX_AGE):
+        result["reason"] = "出生日期不合法"
+        return result
+    birthday = f"{year:04d}-{month:02d}-{day:02d}"
 
     # 校验位
     if calc_check_digit(id_number[:-1]) != id_number[-1]:
@@ -134,49 +419,216 @@ def check_id_card(id_number, region_dict):
     })
     return result
 
+# ==========================================================
+# 流式分块检测
+# ==========================================================
+# 每块处理的身份证号数量
+DEFAULT_CHUNK_SIZE = 10000
+# 结果文件写缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
+
+RESULT_HEADER = "身份证号\t是否合法\t地区\t生日\t性别\t说明\n"
+
+
+def iter_id_chunks(id_file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """逐块读取身份证号文件，每块最多 chunk_size 条（跳过空行）"""
+    with open(id_file_path, "r", encoding="utf-8", errors="ignore") as f:
+        chunk = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# 工作进程内的检测数据（由 _init_worker 在每个进程中初始化一次）
+_WORKER_STATE = {}
+
+
+def _init_worker(region_dict, current_year):
+    """工作进程初始化：保存区码表与当前年份"""
+    _WORKER_STATE["region_dict"] = region_dict
+    _WORKER_STATE["current_year"] = current_year
+
+
+def _worker_check_chunk(ids):
+    """检测一块身份证号"""
+    region_dict = _WORKER_STATE["region_dict"]
+    current_year = _WORKER_STATE["current_year"]
+    return [check_id_card(idn, region_dict, current_year) for idn in ids]
+
+
+def _worker_format_chunk(ids):
+    """工作进程中检测一块身份证号并直接格式化为结果文本，主进程只负责写出"""
+    return format_result_block(_worker_check_chunk(ids))
+
+
+def format_result_line(r):
+    """把一条检测结果格式化为 result.txt 中的一行"""
+    return (
+        f"{r['id']}\t"
+        f"{'是' if r['is_valid'] else '否'}\t"
+        f"{r['region']}\t"
+        f"{r['birthday']}\t"
+        f"{r['gender']}\t"
+        f"{r['reason']}\n"
+    )
+
+
+def format_result_block(results):
+    """把一块检测结果格式化为 result.txt 中的文本，返回 (文本, 条数, 合法条数)"""
+    return ("".join(format_result_line(r) for r in results), len(results),
+            sum(1 for r in results if r["is_valid"]))
+
+
+def write_results(result_blocks, output_file, progress_interval=DEFAULT_PROGRESS_INTERVAL):
+    """
+    逐块写出已格式化的检测结果（见 format_result_block），不在内存中保留全部结果
+
+    返回：(总条数, 合法条数)
+    """
+    total = 0
+    valid_count = 0
+    progress = ProgressReporter(progress_interval)
+    with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(RESULT_HEADER)
+        for text, count, valid in result_blocks:
+            f.write(text)
+            total += count
+            valid_count += valid
+            progress.update(count)
+    print(f"[信息] 处理速度：{progress.rate():.0f} 条/秒")
+    return total, valid_count
+
+
+# ==========================================================
+# 去重模式：重复出现的身份证号只检测一次
+# ==========================================================
+# 缓存值对应的结果字段（不含原始身份证号）
+_RESULT_FIELDS = ("is_valid", "region", "birthday", "gender", "reason")
+
+
+class ResultCache(batch_io.ResultCache):
+    """规范化身份证号 -> 检测结果 的 LRU 去重缓存，缓存值为结果中号码以外的字段"""
+
+    normalize = staticmethod(normalize_id)
+
+    @staticmethod
+    def to_value(r):
+        return tuple(r[f] for f in _RESULT_FIELDS)
+
+    @staticmethod
+    def from_value(idn, value):
+        return {"id": idn, **dict(zip(_RESULT_FIELDS, value))}
+
+
+def _dedup_digest(region_files, current_year):
+    """持久化去重缓存的键：各版本区码表内容哈希与当前年份（年龄判断随年份变化）"""
+    h = hashlib.sha256()
+    for path in region_files:
+        h.update(_file_digest(path).encode())
+        h.update(b"\0")
+    h.update(str(current_year).encode())
+    return h.hexdigest()
+
+
 # ==========================================================
 # 主执行逻辑
 # ==========================================================
-def main(id_file_path, region_file_path="region_codes.xlsx", output_file="result.txt"):
-    region_dict = load_region_codes(region_file_path)
-    if not region_dict:
-        print("[错误] 未能加载任何行政区数据，程序中止。")
+def main(id_file_path, region_file_path="region_codes.xlsx", output_file="result.txt",
+         workers=1, chunk_size=DEFAULT_CHUNK_SIZE, progress_interval=DEFAULT_PROGRESS_INTERVAL,
+         dedup=False, dedup_size=DEFAULT_DEDUP_SIZE, dedup_cache=None):
+    """
+    :param region_file_path: 区码表文件，或按从旧到新排列的多个历史版本文件列表
+    :param dedup: 去重模式，重复号码只检测一次
+    :param dedup_cache: 去重缓存持久化文件（隐含 dedup），区码表未变化时复用上次的结果
+    """
+    if isinstance(region_file_path, (str, Path)):
+        region_file_path = [region_file_path]
+    try:
+        region_dict = RegionIndex.from_files(region_file_path)
+    except ValueError as e:
+        print(f"[错误] {e}，程序中止。")
         return
+    if len(region_dict.versions) > 1:
+        print(f"[信息] 区码索引：{len(region_dict)} 个区码，版本 {'、'.join(region_dict.versions)}")
 
-    # 读取身份证号
-    with open(id_file_path, "r", encoding="utf-8", errors="ignore") as f:
-        ids = [line.strip() for line in f if line.strip()]
-
-    results = []
-    for idn in ids:
-        res = check_id_card(idn, region_dict)
-        results.append(res)
-        # 调试输出每条结果
-        print(res)
-
-    # 写入结果
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("身份证号\t是否合法\t地区\t生日\t性别\t说明\n")
-        for r in results:
-            f.write(
-                f"{r['id']}\t"
-                f"{'是' if r['is_valid'] else '否'}\t"
-                f"{r['region']}\t"
-                f"{r['birthday']}\t"
-                f"{r['gender']}\t"
-                f"{r['reason']}\n"
-            )
-
-    print(f"[完成] 检测完成，共 {len(results)} 条结果，已输出至 {output_file}")
+    # 分块读取、检测并写出，结果按输入顺序输出，内存占用与输入规模无关
+    current_year = refresh_current_year()
+    chunks = iter_id_chunks(id_file_path, max(1, chunk_size))
+
+    # 去重模式：主进程剔除重复号码，只把首次出现的号码交给检测
+    result_cache = None
+    if dedup or dedup_cache:
+        result_cache = ResultCache(dedup_size)
+        if dedup_cache:
+            digest = _dedup_digest(region_file_path, current_year)
+            loaded = result_cache.load(dedup_cache, digest)
+            print(f"[信息] 去重缓存：已载入 {loaded} 条历史结果")
+        chunks = result_cache.split_chunks(chunks)
+
+    # 无去重时在工作进程中格式化结果，避免逐条结果对象的序列化开销
+    chunk_func = _worker_check_chunk if result_cache is not None else _worker_format_chunk
+    pool = None
+    if workers > 1:
+        # 多进程：区码表在每个进程初始化时传入一次，而非随每块任务传递
+        print(f"[信息] 使用 {workers} 个进程并行检测")
+        pool = multiprocessing.Pool(workers, initializer=_init_worker,
+                                    initargs=(region_dict, current_year))
+        result_chunks = imap_ordered(pool, chunk_func, chunks, workers * 4)
+    else:
+        _init_worker(region_dict, current_year)
+        result_chunks = map(chunk_func, chunks)
+    if result_cache is not None:
+        result_chunks = map(format_result_block, result_cache.join_results(result_chunks))
+
+    try:
+        total, valid_count = write_results(result_chunks, output_file, progress_interval)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    if dedup_cache:
+        result_cache.save(dedup_cache, digest)
+
+    print(f"[完成] 检测完成，共 {total} 条结果（合法 {valid_count} 条），已输出至 {output_file}")
+    if result_cache is not None:
+        print(f"[信息] 去重：{result_cache.summary()}")
 
 # ==========================================================
 # 命令行入口
 # ==========================================================
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("用法: python3 ID_card.py id.txt")
-        sys.exit(1)
+def parse_args():
+    """命令行参数解析"""
+    p = argparse.ArgumentParser(description="身份证号检测")
+    p.add_argument("id_file", help="输入文件，每行一个身份证号")
+    p.add_argument("-r", "--region-file", action="append",
+                   help="行政区码表文件（默认 region_codes.xlsx）；可重复指定多个历史版本，"
+                        "按从旧到新的顺序，同一区码以最新版本的名称为准")
+    p.add_argument("-o", "--output", default="result.txt", help="结果输出文件（默认 result.txt）")
+    p.add_argument("--workers", type=int, default=1,
+                   help="并行检测的进程数，1 表示单进程（默认 1）")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help=f"每块处理的身份证号数量（默认 {DEFAULT_CHUNK_SIZE}）")
+    p.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                   help=f"进度输出间隔秒数，0 表示不输出（默认 {DEFAULT_PROGRESS_INTERVAL:g}）")
+    p.add_argument("--dedup", action="store_true",
+                   help="去重模式：重复号码只检测一次，结果取自 LRU 缓存")
+    p.add_argument("--dedup-size", type=int, default=DEFAULT_DEDUP_SIZE,
+                   help=f"去重缓存容量（条，默认 {DEFAULT_DEDUP_SIZE}）")
+    p.add_argument("--dedup-cache",
+                   help="去重缓存持久化文件（隐含 --dedup）；区码表未变化时复用上次的检测结果")
+    return p.parse_args()
+
 
-    id_file = sys.argv[1]
-    region_file = "region_codes.xlsx"
-    main(id_file, region_file)
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.id_file, args.region_file or ["region_codes.xlsx"], args.output,
+         workers=args.workers, chunk_size=args.chunk_size,
+         progress_interval=args.progress_interval, dedup=args.dedup,
+         dedup_size=args.dedup_size, dedup_cache=args.dedup_cache)
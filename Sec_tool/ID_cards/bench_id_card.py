@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+身份证号检测性能基准
+-----------------------------------------
+startup —— 启动开销：在全新的子进程中分别测量以下场景的耗时与峰值内存（RSS），取多次运行的中位数：
+- eager_pandas：先 import pandas 再 import ID_card（等同于模块顶层导入 pandas 的旧版本）
+- import：仅 import ID_card（pandas 延迟到解析 Excel 时才导入）
+- import+cache：import ID_card 并从缓存加载区码表
+- import+excel：import ID_card 并跳过缓存、直接解析 Excel（会导入 pandas/openpyxl）
+
+参考结果（Python 3.11，Linux x86_64）：
+
+    场景              耗时(ms)   峰值RSS(MB)
+    eager_pandas        ~436        ~67
+    import               ~13        ~18
+    import+cache         ~12        ~19
+    import+excel        ~570        ~77
+
+corpus / throughput —— 检测吞吐量：
+- 根据 region_codes.xlsx 中的区码生成可复现的合成语料（固定随机种子）：
+  校验位正确的 18 位号码与一部分 15 位号码，并按比例混入格式错误、区码无效、
+  出生日期格式错误、出生日期超出年龄范围、校验位错误五类样本
+- 分阶段测量 load_region_codes（缓存命中 / 重新解析）、check_id_card、
+  check_id_cards_batch（需要 numpy）以及端到端 ID_card.py 的吞吐量（条/秒）、
+  单条耗时 p50/p99 和峰值内存，结果输出为 JSON
+
+单条耗时在吞吐量计时之外另行采样（最多 LATENCY_SAMPLE 条逐条计时），避免计时开销
+影响吞吐量；check_id_cards_batch 的单条耗时为每块平均值的分位数。
+
+用法：
+    python3 bench_id_card.py startup
+    python3 bench_id_card.py startup --repeat 10 -o bench.json
+    python3 bench_id_card.py corpus -n 100000 -o ids.txt
+    python3 bench_id_card.py throughput                        # 默认规模 10k / 100k / 1M
+    python3 bench_id_card.py throughput --sizes 10000 --stages check_id_card main
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from common.bench_utils import numpy_available, peak_rss_kb, run_stage_process, write_corpus
+except ImportError:
+    # 直接运行脚本时 Sec_tool 根目录不在 sys.path 上，公共模块位于 Sec_tool/common
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from common.bench_utils import numpy_available, peak_rss_kb, run_stage_process, write_corpus
+
+BASE_DIR = Path(__file__).parent
+REGION_FILE = BASE_DIR / "region_codes.xlsx"
+
+# 子进程中执行的代码：测量耗时后输出 JSON（耗时毫秒、峰值 RSS KB）
+_STARTUP_SNIPPET = """
+import contextlib, io, json, resource, sys, time
+sys.path.insert(0, {base_dir!r})
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{body}
+elapsed = (time.perf_counter() - start) * 1000
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    peak //= 1024
+print(json.dumps({{"ms": elapsed, "peak_rss_kb": peak}}))
+"""
+
+STARTUP_SCENARIOS = {
+    "eager_pandas": ["import pandas", "import ID_card"],
+    "import": ["import ID_card"],
+    "import+cache": ["import ID_card", "ID_card.load_region_codes({region!r})"],
+    "import+excel": ["import ID_card", "ID_card.load_region_codes({region!r}, use_cache=False)"],
+}
+
+
+def _run_snippet(lines) -> Dict:
+    body = "\n".join("    " + line.format(region=str(REGION_FILE)) for line in lines)
+    code = _STARTUP_SNIPPET.format(base_dir=str(BASE_DIR), body=body)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(repeat: int = 5) -> Dict[str, Dict]:
+    """测量各启动场景的耗时与峰值内存（中位数）"""
+    # 预热：确保区码表缓存已生成
+    _run_snippet(STARTUP_SCENARIOS["import+cache"])
+    results = {}
+    for name, lines in STARTUP_SCENARIOS.items():
+        runs = [_run_snippet(lines) for _ in range(repeat)]
+        results[name] = {
+            "ms": statistics.median(r["ms"] for r in runs),
+            "peak_rss_kb": statistics.median(r["peak_rss_kb"] for r in runs),
+        }
+    return results
+
+
+# ==========================================================
+# 合成语料生成
+# ==========================================================
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_SEED = 20240601
+
+# 语料中各类号码的比例（其余为合法号码）
+DEFAULT_MIX = {
+    "format": 0.05,        # 长度错误或含非法字符
+    "region": 0.05,        # 区码（含地市、省级回退）均不存在
+    "birth_format": 0.03,  # 出生日期不存在（如 2 月 30 日、13 月）
+    "birth_range": 0.02,   # 出生日期有效，但年龄不在 0-120 岁之间
+    "checksum": 0.05,      # 其余正确，校验位错误
+}
+# 合法号码中以 15 位老号码形式出现的比例
+DEFAULT_SHORT_SHARE = 0.10
+
+STAGES = ["load_region_codes", "check_id_card", "check_id_cards_batch", "main"]
+
+# 阶段内分块读取语料的大小
+CHUNK_SIZE = 10000
+# 逐条计时采样的最大条数
+LATENCY_SAMPLE = 100_000
+# load_region_codes 阶段的重复次数
+LOAD_REPEAT = 5
+
+
+def _load_region_dict() -> Dict[str, str]:
+    import ID_card
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ID_card.load_region_codes(str(REGION_FILE))
+
+
+def _random_birth(rnd: random.Random, year: int) -> str:
+    import ID_card
+    month = rnd.randint(1, 12)
+    days = ID_card.DAYS_IN_MONTH[month]
+    return f"{year:04d}{month:02d}{rnd.randint(1, days):02d}"
+
+
+def generate_corpus(size: int, region_dict: Dict[str, str], seed: int = DEFAULT_SEED,
+                    mix: Optional[Dict[str, float]] = None,
+                    short_share: float = DEFAULT_SHORT_SHARE) -> Iterator[str]:
+    """
+    生成 size 个合成身份证号
+
+    合法号码的区码依次轮询区码表中的所有区码，其余按 mix 比例生成各类失败样本。
+    相同 seed 生成的语料完全一致（年龄范围以运行当年为准）。
+    """
+    import ID_card
+
+    mix = mix or DEFAULT_MIX
+    rnd = random.Random(seed)
+    codes = sorted(c for c in region_dict if c.isascii() and c.isdigit())
+    provinces = {c[:2] for c in codes}
+    free_prefixes = [f"{p:02d}" for p in range(100) if f"{p:02d}" not in provinces]
+    this_year = datetime.now().year
+    thresholds = []
+    acc = 0.0
+    for kind, share in mix.items():
+        acc += share
+        thresholds.append((acc, kind))
+
+    for n in range(size):
+        roll = rnd.random()
+        kind = next((k for t, k in thresholds if roll < t), "valid")
+        region = codes[n % len(codes)]
+        birth = _random_birth(rnd, rnd.randint(this_year - 100, this_year - 1))
+        seq = f"{rnd.randint(0, 999):03d}"
+
+        if kind == "format":
+            body = region + birth + seq
+            yield rnd.choice([body, body + "12", body[:10] + "A" + body[11:] + "0"])
+            continue
+        if kind == "region":
+            region = rnd.choice(free_prefixes) + f"{rnd.randint(0, 9999):04d}"
+        elif kind == "birth_format":
+            year = rnd.randint(this_year - 100, this_year - 1)
+            birth = rnd.choice([f"{year:04d}0230", f"{year:04d}1301", f"{year:04d}0431", f"{year:04d}0100"])
+        elif kind == "birth_range":
+            year = rnd.choice([rnd.randint(this_year - 200, this_year - 121), this_year + rnd.randint(1, 50)])
+            birth = _random_birth(rnd, year)
+
+        id17 = region + birth + seq
+        check = ID_card.calc_check_digit(id17)
+        if kind == "checksum":
+            check = rnd.choice([c for c in "0123456789X" if c != check])
+        elif kind == "valid" and birth.startswith("19") and rnd.random() < short_share:
+            # 15 位老号码：省略年份前两位 "19"，无校验位
+            yield region + birth[2:] + seq
+            continue
+        yield id17 + check
+
+
+def ensure_corpus(size: int, seed: int, corpus_dir: Path, region_dict: Dict[str, str]) -> Path:
+    """生成（或复用已生成的）语料文件"""
+    path = corpus_dir / f"ids_{size}_{seed}_{datetime.now().year}.txt"
+    return write_corpus(path, generate_corpus(size, region_dict, seed))
+
+
+# ==========================================================
+# 吞吐量各阶段
+# ==========================================================
+def _percentiles_us(samples_ns: List[float]) -> Dict[str, Optional[float]]:
+    """单条耗时的 p50/p99（微秒）"""
+    if not samples_ns:
+        return {"p50_us": None, "p99_us": None}
+    ordered = sorted(samples_ns)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1000
+    return {"p50_us": pick(0.50), "p99_us": pick(0.99)}
+
+
+def _run_stage(stage: str, corpus: Optional[Path], queue) -> None:
+    """在子进程中执行一个阶段，并把耗时和峰值内存放入 queue"""
+    sys.path.insert(0, str(BASE_DIR))
+    import ID_card
+
+    if stage == "load_region_codes":
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        timings = {}
+        for label, use_cache in (("cached", True), ("parse", False)):
+            runs = []
+            for _ in range(LOAD_REPEAT):
+                start = time.perf_counter()
+                with quiet:
+                    ID_card.load_region_codes(str(REGION_FILE), use_cache=use_cache)
+                runs.append(time.perf_counter() - start)
+            timings[f"{label}_ms"] = statistics.median(runs) * 1000
+        queue.put({"seconds": timings["cached_ms"] / 1000, **timings, "peak_rss_kb": peak_rss_kb()})
+        return
+
+    if stage == "main":
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [sys.executable, str(BASE_DIR / "ID_card.py"), str(corpus),
+                   "-r", str(REGION_FILE), "-o", str(Path(tmp) / "result.txt"),
+                   "--progress-interval", "0"]
+            start = time.perf_counter()
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - start
+        queue.put({"seconds": elapsed, "p50_us": None, "p99_us": None,
+                   "peak_rss_kb": peak_rss_kb(resource.RUSAGE_CHILDREN)})
+        return
+
+    region_dict = _load_region_dict()
+    current_year = ID_card.refresh_current_year()
+    latencies = []
+    if stage == "check_id_card":
+        check = ID_card.check_id_card
+
+        def run(chunk):
+            for idn in chunk:
+                check(idn, region_dict, current_year)
+
+        def sample(chunk):
+            clock = time.perf_counter_ns
+            for idn in chunk:
+                t0 = clock()
+                check(idn, region_dict, current_year)
+                latencies.append(clock() - t0)
+    elif stage == "check_id_cards_batch":
+        from id_kernel import check_id_cards_batch
+
+        def run(chunk):
+            check_id_cards_batch(chunk, region_dict, current_year)
+
+        def sample(chunk):
+            t0 = time.perf_counter_ns()
+            check_id_cards_batch(chunk, region_dict, current_year)
+            latencies.append((time.perf_counter_ns() - t0) / len(chunk))
+    else:
+        raise ValueError(f"未知阶段：{stage}")
+
+    start = time.perf_counter()
+    for chunk in ID_card.iter_id_chunks(corpus, CHUNK_SIZE):
+        run(chunk)
+    elapsed = time.perf_counter() - start
+
+    sampled = 0
+    for chunk in ID_card.iter_id_chunks(corpus, CHUNK_SIZE):
+        if sampled >= LATENCY_SAMPLE:
+            break
+        sample(chunk)
+        sampled += len(chunk)
+    queue.put({"seconds": elapsed, **_percentiles_us(latencies), "peak_rss_kb": peak_rss_kb()})
+
+
+def run_stage(stage: str, corpus: Optional[Path] = None) -> Dict:
+    """在独立子进程中运行阶段；子进程异常退出时抛出 RuntimeError"""
+    return run_stage_process(stage, _run_stage, stage, corpus)
+
+
+def bench_throughput(sizes: List[int], stages: List[str], seed: int, corpus_dir: Path) -> Dict:
+    """按规模生成语料并逐阶段测量，返回报告中的 load_region_codes 与 results 部分"""
+    stages = list(stages)
+    if "check_id_cards_batch" in stages and not numpy_available():
+        print("[警告] 未安装 numpy，跳过 check_id_cards_batch 阶段")
+        stages.remove("check_id_cards_batch")
+
+    report = {"load_region_codes": None, "results": []}
+    if "load_region_codes" in stages:
+        stages.remove("load_region_codes")
+        try:
+            r = run_stage("load_region_codes")
+        except RuntimeError as e:
+            print(f"    - load_region_codes  [错误] {e}")
+            r = {"error": str(e)}
+        report["load_region_codes"] = r
+        if "error" not in r:
+            print(f"    - load_region_codes  缓存命中 {r['cached_ms']:8.1f} ms  重新解析 {r['parse_ms']:8.1f} ms  "
+                  f"峰值 {r['peak_rss_kb'] / 1024:8.1f} MB")
+
+    region_dict = _load_region_dict()
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for size in sizes:
+        print(f"[信息] 准备语料：{size} 条")
+        corpus = ensure_corpus(size, seed, corpus_dir, region_dict)
+        for stage in stages:
+            try:
+                r = run_stage(stage, corpus)
+            except RuntimeError as e:
+                print(f"    - {stage:<20} [错误] {e}")
+                report["results"].append({"stage": stage, "size": size, "error": str(e)})
+                continue
+            r.update({
+                "stage": stage,
+                "size": size,
+                "ids_per_sec": size / r["seconds"] if r["seconds"] > 0 else None,
+            })
+            report["results"].append(r)
+            latency = (f"p50 {r['p50_us']:7.2f} us  p99 {r['p99_us']:7.2f} us"
+                       if r["p50_us"] is not None else " " * 30)
+            print(f"    - {stage:<20} {r['seconds']:9.3f} s  {r['ids_per_sec']:>12,.0f} 条/秒  "
+                  f"{latency}  峰值 {r['peak_rss_kb'] / 1024:8.1f} MB")
+    return report
+
+
+# ==========================================================
+# 主执行逻辑
+# ==========================================================
+def parse_args():
+    p = argparse.ArgumentParser(description="身份证号检测性能基准")
+    sub = p.add_subparsers(dest="command", required=True)
+    sp = sub.add_parser("startup", help="测量导入与区码表加载的启动开销")
+    sp.add_argument("--repeat", type=int, default=5, help="每个场景运行次数（取中位数）")
+    sp.add_argument("-o", "--out", default="bench_id_card_startup.json", help="JSON 结果文件")
+
+    cp = sub.add_parser("corpus", help="生成合成身份证号语料")
+    cp.add_argument("-n", "--size", type=int, default=100_000, help="语料条数（默认 100000）")
+    cp.add_argument("--seed", type=int, default=DEFAULT_SEED, help="语料随机种子")
+    cp.add_argument("-o", "--out", default="ids_corpus.txt", help="输出文件")
+
+    tp = sub.add_parser("throughput", help="分阶段测量检测吞吐量、单条耗时与峰值内存")
+    tp.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                    help="语料规模（默认 10000 100000 1000000）")
+    tp.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="要测量的阶段")
+    tp.add_argument("--seed", type=int, default=DEFAULT_SEED, help="语料随机种子")
+    tp.add_argument("--corpus-dir", default=str(Path(tempfile.gettempdir()) / "id_card_bench"),
+                    help="语料缓存目录（相同规模与种子的语料会复用）")
+    tp.add_argument("-o", "--out", default="bench_id_card.json", help="JSON 结果文件")
+    return p.parse_args()
+
+
+def _write_report(path: str, meta: Dict, body: Dict):
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **meta,
+    }
+    Path(path).write_text(json.dumps({"meta": meta, **body}, indent=2, ensure_ascii=False),
+                          encoding="utf-8")
+    print(f"[完成] 基准结果已保存至：{path}")
+
+
+def main():
+    args = parse_args()
+    if args.command == "corpus":
+        sys.path.insert(0, str(BASE_DIR))
+        region_dict = _load_region_dict()
+        with open(args.out, "w", encoding="utf-8") as f:
+            for idn in generate_corpus(args.size, region_dict, args.seed):
+                f.write(idn + "\n")
+        print(f"[完成] 已生成 {args.size} 条语料：{args.out}")
+    elif args.command == "throughput":
+        sys.path.insert(0, str(BASE_DIR))
+        body = bench_throughput(args.sizes, args.stages, args.seed, Path(args.corpus_dir))
+        _write_report(args.out, {"seed": args.seed, "mix": DEFAULT_MIX,
+                                 "short_share": DEFAULT_SHORT_SHARE}, body)
+    elif args.command == "startup":
+        results = bench_startup(args.repeat)
+        print(f"{'场景':<16}{'耗时(ms)':>10}{'峰值RSS(MB)':>14}")
+        for name, r in results.items():
+            print(f"{name:<16}{r['ms']:>10.1f}{r['peak_rss_kb'] / 1024:>14.1f}")
+        _write_report(args.out, {"repeat": args.repeat}, {"startup": results})
+
+
+if __name__ == "__main__":
+    main()
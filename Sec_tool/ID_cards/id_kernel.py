@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+身份证号批量检测模块（NumPy 向量化）
+-----------------------------------------
+功能：
+1. 把 N 个身份证号转为 N×18 的数字矩阵（校验位 X 记为 10）
+2. 一次矩阵-向量乘法 mod 11 算出全部校验位
+3. 以整数数组提取区码、出生日期（YYYYMMDD）和性别奇偶
+4. 逐行的合法性与原因说明与 ID_card.check_id_card 完全一致
+
+依赖：numpy
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ID_card import RegionIndex, calc_check_digit, check_id_card
+
+# 原因代码，与 check_id_card 的 reason 一一对应
+REASONS = ["合法", "格式错误", "行政区码无效", "出生日期格式错误", "出生日期不合法", "校验位错误"]
+REASON_OK, REASON_FORMAT, REASON_REGION, REASON_BIRTH_FORMAT, REASON_BIRTH_RANGE, REASON_CHECKSUM = range(6)
+_REASON_CODE = {r: i for i, r in enumerate(REASONS)}
+
+_CLEAN_RE = re.compile(r"[\s-]")
+_FORMAT_RE = re.compile(r"\d{15}|\d{17}[\dX]")
+
+_WEIGHTS = np.array([7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2], dtype=np.float32)
+# s % 11 -> 校验位数值（X 记为 10），对应 check_map "10X98765432"
+_CHECK_VALUES = np.array([1, 0, 10, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+# 各月天数（下标为月份，0 占位）
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+_REGION_PLACES = np.array([100000, 10000, 1000, 100, 10, 1], dtype=np.int64)
+_YEAR_PLACES = np.array([1000, 100, 10, 1], dtype=np.int64)
+
+# 分批处理的行数，控制中间矩阵的内存
+BATCH_ROWS = 1 << 18
+
+
+class IdBatchResult(NamedTuple):
+    """
+    批量检测结果
+
+    - ids：原始输入
+    - is_valid：每行是否合法
+    - reason_codes：原因代码（下标对应 REASONS）
+    - region_codes：6 位区码（格式错误的行为 -1）
+    - birth_dates：出生日期 YYYYMMDD（格式错误的行为 -1）
+    - gender_parity：第 17 位的奇偶，1=男、0=女（格式错误的行为 -1）
+    - region_names：区码对应的地区名称（未匹配为 ""）
+    """
+    ids: Sequence[str]
+    is_valid: np.ndarray
+    reason_codes: np.ndarray
+    region_codes: np.ndarray
+    birth_dates: np.ndarray
+    gender_parity: np.ndarray
+    region_names: List[str]
+
+    @property
+    def reasons(self) -> List[str]:
+        return [REASONS[c] for c in self.reason_codes]
+
+    def to_results(self) -> Iterator[Dict]:
+        """逐行生成与 check_id_card 相同结构的结果字典"""
+        for i, id_number in enumerate(self.ids):
+            code = int(self.reason_codes[i])
+            result = {
+                "id": id_number,
+                "is_valid": code == REASON_OK,
+                "region": "",
+                "birthday": "",
+                "gender": "",
+                "reason": REASONS[code],
+            }
+            if code == REASON_REGION:
+                result["region"] = "未知地区"
+            elif code == REASON_OK:
+                birth = int(self.birth_dates[i])
+                result.update({
+                    "region": self.region_names[i],
+                    "birthday": f"{birth // 10000:04d}-{birth // 100 % 100:02d}-{birth % 100:02d}",
+                    "gender": "男" if self.gender_parity[i] == 1 else "女",
+                })
+            yield result
+
+
+def _resolve_region(code: int, region_dict: Dict[str, str]) -> str:
+    """按 区县 -> 地市 -> 省 的顺序查找地区名称"""
+    region_code = f"{code:06d}"
+    return (
+        region_dict.get(region_code)
+        or region_dict.get(region_code[:4] + "00")
+        or region_dict.get(region_code[:2] + "0000")
+        or ""
+    )
+
+
+def _resolve_region_ids(codes: np.ndarray, index: RegionIndex) -> np.ndarray:
+    """在 RegionIndex 的稠密数组上按 区县 -> 地市 -> 省 回退，返回名称下标（-1 为未命中）"""
+    table = np.frombuffer(index.name_ids, dtype=np.int32)
+    ids = table[codes]
+    for fallback in (codes // 100 * 100, codes // 10000 * 10000):
+        missing = ids < 0
+        ids[missing] = table[fallback[missing]]
+    return ids
+
+
+def _check_matrix(ids18: List[str], is15: np.ndarray, region_dict: Dict[str, str], now_year: int):
+    """对规范化为 18 位的身份证号做向量化检测，返回各数组"""
+    n = len(ids18)
+    digits = (np.array(ids18, dtype="S18").view(np.uint8).reshape(n, 18) - np.uint8(48)).astype(np.int64)
+    digits[digits == ord("X") - 48] = 10
+
+    # 校验位：前 17 位加权和 mod 11（float32 矩阵乘法，最大和 900 可精确表示）
+    weighted = (digits[:, :17].astype(np.float32) @ _WEIGHTS).astype(np.int64)
+    expected = _CHECK_VALUES[weighted % 11]
+    checksum_ok = is15 | (expected == digits[:, 17])
+
+    # 区码
+    region_codes = digits[:, :6] @ _REGION_PLACES
+    if isinstance(region_dict, RegionIndex):
+        name_ids = _resolve_region_ids(region_codes, region_dict)
+        region_ok = name_ids >= 0
+        names = region_dict.names
+        region_names = [names[i] if i >= 0 else "" for i in name_ids.tolist()]
+    else:
+        unique_codes, inverse = np.unique(region_codes, return_inverse=True)
+        unique_names = [_resolve_region(int(c), region_dict) for c in unique_codes]
+        region_ok = np.array([bool(name) for name in unique_names], dtype=bool)[inverse]
+        region_names = [unique_names[i] for i in inverse]
+
+    # 出生日期：公历日期有效（含闰年），且年龄在 0-120 岁之间
+    year = digits[:, 6:10] @ _YEAR_PLACES
+    month = digits[:, 10] * 10 + digits[:, 11]
+    day = digits[:, 12] * 10 + digits[:, 13]
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    month_ok = (month >= 1) & (month <= 12)
+    dim = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + (month_ok & (month == 2) & leap)
+    birth_ok = (year >= 1) & month_ok & (day >= 1) & (day <= dim)
+    age = now_year - year
+    age_ok = (age >= 0) & (age <= 120)
+
+    reason = np.full(n, REASON_OK, dtype=np.int8)
+    reason[~checksum_ok] = REASON_CHECKSUM
+    reason[~age_ok] = REASON_BIRTH_RANGE
+    reason[~birth_ok] = REASON_BIRTH_FORMAT
+    reason[~region_ok] = REASON_REGION
+
+    birth_dates = year * 10000 + month * 100 + day
+    gender = digits[:, 16] % 2
+    return reason, region_codes, birth_dates, gender, region_names
+
+
+def check_id_cards_batch(id_numbers: Sequence[str], region_dict: Dict[str, str],
+                         now_year: Optional[int] = None) -> IdBatchResult:
+    """
+    批量检测身份证号
+
+    :param id_numbers: 身份证号序列，允许含空格和横杠
+    :param region_dict: load_region_codes 的结果，或 RegionIndex
+    :param now_year: 计算年龄使用的当前年份（默认取当前时间，整批只取一次；
+                     不修改 ID_card 模块级的年份）
+    """
+    if now_year is None:
+        now_year = datetime.now().year
+
+    ids = list(id_numbers)
+    n = len(ids)
+    reason_codes = np.full(n, REASON_FORMAT, dtype=np.int8)
+    region_codes = np.full(n, -1, dtype=np.int64)
+    birth_dates = np.full(n, -1, dtype=np.int64)
+    gender_parity = np.full(n, -1, dtype=np.int8)
+    region_names = [""] * n
+
+    for start in range(0, n, BATCH_ROWS):
+        rows = []
+        ids18 = []
+        is15 = []
+        for i in range(start, min(n, start + BATCH_ROWS)):
+            id_number = _CLEAN_RE.sub("", ids[i]).upper()
+            if not _FORMAT_RE.fullmatch(id_number):
+                continue
+            if not id_number.isascii():
+                # 全角等非 ASCII 数字：逐条检测，保证与 check_id_card 一致
+                res = check_id_card(ids[i], region_dict, now_year)
+                reason_codes[i] = _REASON_CODE[res["reason"]]
+                if res["is_valid"]:
+                    region_names[i] = res["region"]
+                    region_codes[i] = int(id_number[:6])
+                    birth_dates[i] = int(res["birthday"].replace("-", ""))
+                    gender_parity[i] = 1 if res["gender"] == "男" else 0
+                continue
+            if len(id_number) == 15:
+                id_number = id_number[:6] + "19" + id_number[6:]
+                id_number += calc_check_digit(id_number)
+                is15.append(True)
+            else:
+                is15.append(False)
+            rows.append(i)
+            ids18.append(id_number)
+
+        if not rows:
+            continue
+        idx = np.array(rows, dtype=np.int64)
+        reason, regions, births, gender, names = _check_matrix(
+            ids18, np.array(is15, dtype=bool), region_dict, now_year)
+        reason_codes[idx] = reason
+        region_codes[idx] = regions
+        birth_dates[idx] = births
+        gender_parity[idx] = gender
+        for row, name in zip(rows, names):
+            region_names[row] = name
+
+    return IdBatchResult(ids, reason_codes == REASON_OK, reason_codes, region_codes,
+                         birth_dates, gender_parity, region_names)
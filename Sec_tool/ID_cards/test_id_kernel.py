@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+id_kernel 回归测试：批量检测与逐条 check_id_card 结果一致
+
+区码表用 dict 和 RegionIndex 各跑一遍，覆盖 15 位号码、小写 x、
+全角数字、闰日和年龄上下限。
+
+运行：python3 -m pytest test_id_kernel.py
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import ID_card  # noqa: E402
+import id_kernel  # noqa: E402
+
+NOW_YEAR = 2026
+
+REGIONS = {
+    "110000": "北京市",
+    "110100": "北京市市辖区",
+    "110105": "北京市朝阳区",
+    "440000": "广东省",
+    "440300": "广东省深圳市",
+    "510000": "四川省",
+}
+
+_FULL_WIDTH = str.maketrans("0123456789X", "０１２３４５６７８９Ｘ")
+
+
+def make_id(region, year, month, day, seq=123):
+    """按给定字段拼出带正确校验位的 18 位身份证号"""
+    id17 = f"{region}{year:04d}{month:02d}{day:02d}{seq:03d}"
+    return id17 + ID_card.calc_check_digit(id17)
+
+
+def _x_id():
+    """校验位为 X 的合法号码"""
+    for seq in range(1000):
+        id_number = make_id("110105", 1949, 12, 31, seq)
+        if id_number.endswith("X"):
+            return id_number
+    raise AssertionError("未找到校验位为 X 的号码")
+
+
+def _cases():
+    x_id = _x_id()
+    valid = make_id("110105", 1990, 1, 1)
+    cases = [
+        valid, valid[:17] + ("0" if valid[17] != "0" else "1"),
+        x_id, x_id.lower(), x_id[:6] + " " + x_id[6:14] + "-" + x_id[14:],
+        # 15 位号码（年份补 19，无校验位）
+        "110105900101123", "440300991231001", "110105900230123", "990000900101123",
+        # 全角数字 / 全角 X
+        valid.translate(_FULL_WIDTH), x_id.translate(_FULL_WIDTH),
+        # 闰日
+        make_id("440300", 2000, 2, 29), make_id("440300", 2004, 2, 29),
+        make_id("440300", 1996, 2, 29), make_id("440300", 1913, 2, 29),
+        make_id("440300", 2001, 2, 29), make_id("440300", 1999, 2, 29),
+        make_id("440300", 1990, 2, 30), make_id("440300", 1990, 4, 31),
+        make_id("440300", 1990, 13, 1), make_id("440300", 1990, 0, 1), make_id("440300", 1990, 1, 0),
+        # 年龄上下限：0 岁、120 岁合法，未来年份、121 岁不合法
+        make_id("510000", NOW_YEAR, 1, 1), make_id("510000", NOW_YEAR + 1, 1, 1),
+        make_id("510000", NOW_YEAR - 120, 6, 15), make_id("510000", NOW_YEAR - 121, 6, 15),
+        # 区码回退：区县 -> 地市 -> 省，未知区码
+        make_id("110199", 1990, 1, 1), make_id("449999", 1990, 1, 1), make_id("990101", 1990, 1, 1),
+        # 格式错误
+        "", "abc", valid[:17], valid + "1", valid[:17] + "Y", "x" + valid[1:],
+    ]
+    rng = random.Random(1)
+    regions = list(REGIONS) + ["110199", "449999", "990101"]
+    for _ in range(500):
+        id_number = make_id(rng.choice(regions), rng.randint(NOW_YEAR - 125, NOW_YEAR + 2),
+                            rng.randint(0, 13), rng.randint(0, 32), rng.randrange(1000))
+        if rng.random() < 0.3:
+            id_number = id_number[:17] + rng.choice("0123456789X")
+        cases.append(id_number)
+    return cases
+
+
+CASES = _cases()
+
+
+def _region_index():
+    index = ID_card.RegionIndex()
+    index.add_version("test", REGIONS)
+    return index
+
+
+@pytest.mark.parametrize("region_table", [REGIONS, _region_index()], ids=["dict", "RegionIndex"])
+def test_batch_matches_scalar(region_table, monkeypatch):
+    monkeypatch.setattr(id_kernel, "BATCH_ROWS", 64)
+    batch = id_kernel.check_id_cards_batch(CASES, region_table, now_year=NOW_YEAR)
+    expected = [ID_card.check_id_card(c, region_table, NOW_YEAR) for c in CASES]
+    assert list(batch.to_results()) == expected
+    assert batch.is_valid.tolist() == [r["is_valid"] for r in expected]
+    assert batch.reasons == [r["reason"] for r in expected]
+    reasons = set(batch.reasons)
+    assert reasons == set(id_kernel.REASONS)
+
+
+def test_default_year_leaves_module_state(monkeypatch):
+    """now_year 缺省时只在本地取当前年份，不改动 ID_card 的模块级年份"""
+    monkeypatch.setattr(ID_card, "_current_year", 1999)
+    batch = id_kernel.check_id_cards_batch([make_id("110105", 1990, 1, 1)], REGIONS)
+    assert batch.is_valid.tolist() == [True]
+    assert ID_card._current_year == 1999
@@ -1,27 +1,55 @@
 #!/usr/bin/env python3
 """
-dir_scan_sync.py
-最小可用的同步目录敏感路径扫描器（基于 requests 的同步实现）
+dir_serch.py
+目录敏感路径扫描器（基于 requests，提供逐条同步扫描与 asyncio 并发扫描两种引擎）
 
 主要功能：
 - 支持单一目标（-t）或从文件批量导入目标（-T）
 - 读取敏感路径字典（wordlist，每行一个 path）；未提供时使用内置默认列表
 - 逐个请求目标 + 路径组合，记录：HTTP 状态码 / 响应长度 / 关键响应头 / 页首内容片段 / 关键词命中
+- 扫描引擎：sync 逐目标顺序请求（默认）；async 由 asyncio 调度、线程池执行请求，受全局并发
+  （--concurrency）与单主机并发（--per-host）限制，各主机轮转分发，慢主机不会阻塞其他主机
+- 连接复用：每个目标一个 HTTP 会话（keep-alive），DNS 解析结果在一次扫描内缓存复用
+- 预检与熔断：扫描前并发做 DNS 解析与 TCP 存活探测，跳过不可达目标；
+  扫描中目标连续连接失败达到阈值后熔断，跳过其余路径
+- soft-404 校准（可选，--calibrate）：用随机路径识别对任意路径都返回成功页面的兜底响应，过滤与之匹配的记录
+- 正文流式读取并限制上限（--max-body），可选先发 HEAD（--head-first）
 - 支持选项：超时、是否跟随重定向、是否保存所有请求记录（包括 404）以及自定义 UA
 - 扫描结果支持导出为 JSON（默认）与 CSV（可选）
 
+用法：
+    python3 dir_serch.py -t example.com
+    python3 dir_serch.py -T targets.txt -w wordlist.txt -o results.json --csv results.csv
+    python3 dir_serch.py -T targets.txt --engine async --concurrency 50 --per-host 6
+
 使用范围提示：仅在拥有足够授权的前提下对目标进行测试。
 """
 
 import argparse
+import asyncio
 import csv
+import hashlib
+import http.cookiejar
 import json
+import os
+import secrets
+import socket
 import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any
-from urllib.parse import urljoin
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError, ReadTimeoutError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.connection import allowed_gai_family, create_connection
 
 # 内置默认字典。当未提供 --wordlist 时使用该列表。
 # 注意：路径中既包含带斜杠结尾的目录形式，也包含文件形式（如 phpinfo.php）。
@@ -33,6 +61,36 @@ DEFAULT_WORDLIST = [
 # 在响应片段中检索的敏感关键词集合（大小写不敏感对比）
 SENSITIVE_KEYWORDS = ["token", "password", "secret", "apikey", "api_key", "Index of", "Directory listing"]
 
+# 并发引擎默认参数：全局并发请求数 / 单个主机的并发请求数
+DEFAULT_CONCURRENCY = 50
+DEFAULT_PER_HOST = 6
+# 每个目标会话中单个主机保留的最大空闲连接数
+DEFAULT_POOL_SIZE = 10
+
+# 记录中保留的正文片段长度（字符）
+SNIPPET_CHARS = 1000
+# 单个响应最多读取的正文字节数；下限保证 1000 字符的片段（UTF-8 最多 4 字节/字符）总能完整读出
+DEFAULT_MAX_BODY = 64 * 1024
+MIN_MAX_BODY = SNIPPET_CHARS * 4
+# 连续多少次连接失败后熔断目标、跳过其余路径（0 表示不熔断）
+DEFAULT_MAX_FAILURES = 5
+# 计为连接失败的异常类型（记录中的 error_type）：只认 requests.ConnectionError / ConnectTimeout 本身，
+# 其子类 SSLError、ProxyError 以及读超时、重定向过多、解码错误都说明目标可达，不计入熔断
+CONNECTION_ERROR_TYPES = ("ConnectionError", "ConnectTimeout")
+
+# soft-404 校准：每个目标请求的随机路径数、随机路径的后缀（依次轮换）、长度分桶大小
+DEFAULT_CALIBRATION_SAMPLES = 3
+CALIBRATION_SUFFIXES = ("", "/", ".html")
+LENGTH_BUCKET = 32
+# 指纹只对去除回显后片段的前若干字符计算哈希：片段按 1000 字符截断，回显的路径越长，片段末尾越靠前
+FINGERPRINT_CHARS = SNIPPET_CHARS // 2
+# 兜底页每次内容不同时，各样本去除回显后的公共前缀至少这么长才按长度分桶匹配，过短的前缀（如 "<html>"）不足以区分页面
+FINGERPRINT_MIN_PREFIX = 32
+
+# HEAD 优先模式下需要再发 GET 的状态码（< 400 之外）：受限路径的正文可能含关键词，405/501 表示不支持 HEAD；
+# 其余状态（如 404、500）不发 GET，这些响应正文中的关键词不会被检出
+HEAD_GET_STATUS = (401, 403, 405, 501)
+
 
 def normalize_target(url: str) -> str:
     """规范化目标地址：
@@ -70,35 +128,364 @@ def load_targets(path: Path) -> List[str]:
     return [normalize_target(l) for l in lines if l]
 
 
-def probe_url(full_url: str, timeout: int = 8, allow_redirects: bool = True, headers: Dict[str, str] = None) -> Dict[str, Any]:
+def _check_urllib3_hooks():
+    """确认 _ScanPoolManager / ResolverCache 挂接的 urllib3 内部属性存在（requirements.txt 固定 urllib3 2.x）。
+
+    缺失时直接抛出 RuntimeError，而不是在请求中途失败、被记录为普通请求错误，
+    或静默失去连接计数与 DNS 缓存。
+    """
+    missing = [f"HTTPConnectionPool.{name}" for name in ("_new_conn", "_validate_conn")
+               if not callable(getattr(HTTPConnectionPool, name, None))]
+    conn = HTTPConnection("localhost")
+    missing += [f"HTTPConnection.{name}" for name in ("_new_conn", "_dns_host") if not hasattr(conn, name)]
+    if missing:
+        raise RuntimeError(f"unsupported urllib3 {urllib3.__version__}: missing {', '.join(missing)}; "
+                           f"install the version pinned in requirements.txt (urllib3>=2,<3)")
+
+
+class _ScanPoolManager(PoolManager):
+    """扫描会话使用的 PoolManager，在新建的连接池实例上挂接：
+
+    - 连接计数：请求发出前连接尚未建立（sock 为空）即记为一次新建连接，包括断开后的重连
+    - DNS 缓存：给定 resolver（ResolverCache）时，新建的连接经其解析主机名
+    只包装实例上的方法，连接池和连接仍是 urllib3 原类，记录中的 error 与直接请求时一致。
+    挂接依赖 urllib3 2.x 的内部方法，创建时先检查，版本不符时报错（见 _check_urllib3_hooks）。
+    """
+
+    def __init__(self, *args, resolver: "ResolverCache" = None, **kwargs):
+        _check_urllib3_hooks()
+        super().__init__(*args, **kwargs)
+        self.resolver = resolver
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.num_opened = 0
+        validate_conn = pool._validate_conn
+
+        def counting_validate_conn(conn):
+            if getattr(conn, "sock", None) is None:
+                pool.num_opened += 1
+            validate_conn(conn)
+
+        pool._validate_conn = counting_validate_conn
+        if self.resolver is not None:
+            new_conn = pool._new_conn
+            resolver = self.resolver
+
+            def resolving_new_conn():
+                conn = new_conn()
+                resolver.attach(conn)
+                return conn
+
+            pool._new_conn = resolving_new_conn
+        return pool
+
+
+class _ScanAdapter(HTTPAdapter):
+    """使用 _ScanPoolManager（连接计数、可选的 DNS 缓存）的适配器"""
+
+    def __init__(self, *args, resolver: "ResolverCache" = None, **kwargs):
+        # HTTPAdapter.__init__ 中即会调用 init_poolmanager
+        self.resolver = resolver
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager = _ScanPoolManager(num_pools=connections, maxsize=maxsize, block=block,
+                                            resolver=self.resolver, **pool_kwargs)
+
+
+class SessionPool:
+    """按目标复用的 HTTP 会话集合。
+
+    每个目标在首次使用时创建一个 requests.Session，同一目标的全部路径共用该会话，
+    连接保持（keep-alive）后后续请求无需重新建立 TCP 连接和 TLS 握手。
+    - pool_size: 每个主机保留的最大连接数（async 引擎中应不小于 per_host）
+    - keep_alive: False 时每个请求携带 Connection: close，不复用连接
+    - resolver: 可选的 ResolverCache，会话新建连接时使用其缓存的解析结果
+    会话不保存服务端下发的 Cookie，探测结果与逐条独立请求一致。
+    逐目标扫描时，目标结束后调用 release 关闭其会话，避免空闲连接累积到整个扫描结束。
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, resolver: "ResolverCache" = None):
+        self.pool_size = max(1, pool_size)
+        self.keep_alive = keep_alive
+        self.resolver = resolver
+        self.sessions: Dict[str, requests.Session] = {}
+        self.closed_connections = 0
+        self.closed_requests = 0
+
+    def get(self, target: str) -> requests.Session:
+        session = self.sessions.get(target)
+        if session is None:
+            session = requests.Session()
+            adapter = _ScanAdapter(pool_maxsize=self.pool_size, resolver=self.resolver)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            if not self.keep_alive:
+                session.headers["Connection"] = "close"
+            self.sessions[target] = session
+        return session
+
+    @staticmethod
+    def _count(session: requests.Session) -> Tuple[int, int]:
+        """单个会话各连接池的新建连接数与请求数"""
+        connections = requests_sent = 0
+        adapters = {id(a): a for a in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                connections += getattr(pool, "num_opened", pool.num_connections)
+                requests_sent += pool.num_requests
+        return connections, requests_sent
+
+    def release(self, target: str):
+        """目标扫描结束后关闭其会话并释放连接，连接统计仍计入 stats"""
+        session = self.sessions.pop(target, None)
+        if session is not None:
+            connections, requests_sent = self._count(session)
+            self.closed_connections += connections
+            self.closed_requests += requests_sent
+            session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """汇总各会话（含已释放的）新建连接数与请求数，reuse_ratio = 1 - 连接数 / 请求数"""
+        connections, requests_sent = self.closed_connections, self.closed_requests
+        for session in self.sessions.values():
+            c, r = self._count(session)
+            connections += c
+            requests_sent += r
+        reuse = max(0.0, 1 - connections / requests_sent) if requests_sent else 0.0
+        return {"connections": connections, "requests": requests_sent, "reuse_ratio": round(reuse, 4)}
+
+    def close(self):
+        for target in list(self.sessions):
+            self.release(target)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResolverCache:
+    """DNS 解析缓存：同一 (主机, 端口, 参数) 只解析一次；解析失败不缓存，下次使用时重新解析。
+
+    只作用于显式传入它的预检（check_target）和扫描会话（SessionPool），不替换 socket.getaddrinfo，
+    进程内的其他请求（如长期运行的 MCP 服务）不受影响。
+    """
+
+    def __init__(self):
+        self._cache: Dict[tuple, list] = {}
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = socket.getaddrinfo(host, port, family, type, proto, flags)
+            self._cache[key] = cached
+        return list(cached)
+
+    def attach(self, conn):
+        """让 urllib3 连接按缓存的解析结果依次尝试各地址建立 TCP 连接。
+
+        异常与 urllib3 自身解析时一致（NewConnectionError / ConnectTimeoutError，信息中为原主机名）；
+        解析失败时交由 urllib3 原逻辑报错。
+        """
+        new_conn = conn._new_conn
+
+        def resolving_new_conn():
+            try:
+                infos = self.getaddrinfo(conn._dns_host, conn.port, allowed_gai_family(), socket.SOCK_STREAM)
+            except socket.gaierror:
+                return new_conn()
+            error = None
+            for *_, sockaddr in infos:
+                try:
+                    return create_connection((sockaddr[0], conn.port), conn.timeout,
+                                             source_address=conn.source_address, socket_options=conn.socket_options)
+                except OSError as e:
+                    error = e
+            if isinstance(error, socket.timeout):
+                raise ConnectTimeoutError(
+                    conn, f"Connection to {conn.host} timed out. (connect timeout={conn.timeout})") from error
+            raise NewConnectionError(conn, f"Failed to establish a new connection: {error}") from error
+
+        conn._new_conn = resolving_new_conn
+
+
+def check_target(target: str, timeout: int = 8, resolver: ResolverCache = None) -> str:
+    """预检单个目标：解析域名并尝试建立一次 TCP 连接。
+
+    返回空字符串表示可达，否则返回不可达原因。
+    配置了代理的目标不做直连检测（直接视为可达）。
+    给定 resolver 时经其解析，结果可被使用同一 resolver 的扫描会话复用。
+    """
+    parts = urlsplit(target)
+    host = parts.hostname
+    if not host:
+        return "invalid target"
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        return "invalid port"
+    if requests.utils.get_environ_proxies(target):
+        return ""
+    getaddrinfo = resolver.getaddrinfo if resolver is not None else socket.getaddrinfo
+    try:
+        infos = getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        return f"DNS resolution failed: {e}"
+    error = None
+    for family, type_, proto, _, sockaddr in infos:
+        try:
+            with socket.socket(family, type_, proto) as sock:
+                sock.settimeout(timeout)
+                sock.connect(sockaddr)
+            return ""
+        except OSError as e:
+            error = e
+    return f"TCP connect to port {port} failed: {error}"
+
+
+def preflight_targets(targets: List[str], timeout: int = 8,
+                      resolver: ResolverCache = None) -> Tuple[List[str], List[Dict[str, str]]]:
+    """并发预检全部目标，返回 (可达目标列表, 跳过的目标及原因列表)，均保持输入顺序。
+
+    给定 resolver 时，解析结果会被使用同一 resolver 的扫描会话复用。
+    """
+    if not targets:
+        return [], []
+    with ThreadPoolExecutor(max_workers=min(32, len(targets))) as executor:
+        reasons = list(executor.map(partial(check_target, timeout=timeout, resolver=resolver), targets))
+    alive = [t for t, r in zip(targets, reasons) if not r]
+    skipped = [{"target": t, "reason": r} for t, r in zip(targets, reasons) if r]
+    return alive, skipped
+
+
+class CircuitBreaker:
+    """按目标统计连续的连接失败（error_type 属于 CONNECTION_ERROR_TYPES），达到阈值后熔断，跳过该目标的其余路径。
+
+    收到任何响应或其他类型的异常（读超时、SSL 错误、重定向过多等）都会清零计数。
+    - max_failures: 熔断阈值，0 表示不熔断
+    - tripped: 已熔断的目标 -> 原因
+    """
+
+    def __init__(self, max_failures: int = DEFAULT_MAX_FAILURES):
+        self.max_failures = max_failures
+        self.failures: Dict[str, int] = {}
+        self.tripped: Dict[str, str] = {}
+
+    def is_open(self, target: str) -> bool:
+        return target in self.tripped
+
+    def record(self, target: str, rec: Dict[str, Any]):
+        if rec.get("error_type") not in CONNECTION_ERROR_TYPES:
+            self.failures[target] = 0
+            return
+        count = self.failures.get(target, 0) + 1
+        self.failures[target] = count
+        if self.max_failures and count >= self.max_failures and target not in self.tripped:
+            self.tripped[target] = f"circuit open after {count} consecutive connection failures: {rec.get('error')}"
+
+    def skipped(self) -> List[Dict[str, str]]:
+        return [{"target": t, "reason": r} for t, r in self.tripped.items()]
+
+
+def read_body(resp: requests.Response, max_body: int) -> Tuple[bytes, bool]:
+    """流式读取响应正文，最多 max_body 字节，返回 (正文, 是否截断)"""
+    chunks = []
+    size = 0
+    for chunk in resp.iter_content(chunk_size=min(8192, max_body)):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_body:
+            return b"".join(chunks)[:max_body], True
+    return b"".join(chunks), False
+
+
+def decode_body(resp: requests.Response, body: bytes) -> str:
+    """按与 resp.text 相同的规则解码正文：优先使用响应声明的编码，否则自动检测"""
+    if not body:
+        return ""
+    encoding = resp.encoding
+    if encoding is None and requests.compat.chardet is not None:
+        encoding = requests.compat.chardet.detect(body)["encoding"]
+    try:
+        return str(body, encoding or "utf-8", errors="replace")
+    except (LookupError, TypeError):
+        return str(body, errors="replace")
+
+
+def error_type(e: Exception) -> str:
+    """请求异常的类型名；流式读取正文时的读超时被 requests 包装为 ConnectionError，这里还原为 ReadTimeout"""
+    if type(e) is requests.ConnectionError and e.args and isinstance(e.args[0], ReadTimeoutError):
+        return "ReadTimeout"
+    return type(e).__name__
+
+
+def content_length(resp: requests.Response):
+    """返回响应头中的 Content-Length（无或非法时为 None）"""
+    value = resp.headers.get("Content-Length", "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def probe_url(full_url: str, timeout: int = 8, allow_redirects: bool = True, headers: Dict[str, str] = None,
+              session: requests.Session = None, max_body: int = DEFAULT_MAX_BODY, head_first: bool = False) -> Dict[str, Any]:
     """对单个 URL 发起 HTTP GET 探测并提取关键信息。
 
+    正文以流式读取，最多读取 max_body 字节（不低于 MIN_MAX_BODY），大文件不会整体载入内存。
+    head_first 为 True 时先发 HEAD，仅当状态码 < 400 或属于 HEAD_GET_STATUS 时再发 GET；
+    其余状态（如 404、500）直接以 HEAD 响应生成记录，snippet 与 keyword_hits 为空——
+    错误页正文中的关键词（如调试页里的 password）不会被检出，这类记录也就不会被保留。
+
     返回字典包含字段：
     - url: 完整请求 URL
     - status: HTTP 状态码（异常时为 None）
-    - length: 响应正文长度（字符数）
+    - length: 响应正文长度：有 Content-Length 时取其值（字节），否则为正文字符数
+      （正文被截断时为已读取的字节数）
     - headers: 选取的响应头片段（仅挑选 Server / Content-Type）
     - ok: 状态码 < 400 视为成功
     - snippet: 响应正文前 1000 个字符（避免输出过大）
     - keyword_hits: 在 snippet 中命中的敏感关键词列表
     - error: 异常信息（仅在请求异常时填充）
+    - error_type: 异常类型名（如 ConnectTimeout、ReadTimeout、SSLError、TooManyRedirects），熔断器据此判断连接失败
     """
     headers = headers or {"User-Agent": "DirScanSync/1.0 (+https://example.com)"}
+    max_body = max(max_body, MIN_MAX_BODY)
+    request = session.request if session is not None else requests.request
     try:
-        resp = requests.get(full_url, timeout=timeout, allow_redirects=allow_redirects, headers=headers)
-        text = resp.text or ""
+        resp = None
+        if head_first:
+            resp = request("HEAD", full_url, timeout=timeout, allow_redirects=allow_redirects, headers=headers)
+            resp.close()
+            if resp.status_code < 400 or resp.status_code in HEAD_GET_STATUS:
+                resp = None
+        if resp is None:
+            with request("GET", full_url, timeout=timeout, allow_redirects=allow_redirects, headers=headers, stream=True) as resp:
+                body, truncated = read_body(resp, max_body)
+            text = decode_body(resp, body)
+        else:
+            text, truncated = "", False
         # snippet length limited to avoid huge outputs
-        snippet = text[:1000]
+        snippet = text[:SNIPPET_CHARS]
         keyword_hits = [kw for kw in SENSITIVE_KEYWORDS if kw.lower() in snippet.lower()]
+        length = content_length(resp)
+        if length is None:
+            length = len(body) if truncated else len(text)
         return {
             "url": full_url,
             "status": resp.status_code,
-            "length": len(text),
+            "length": length,
             "headers": {k: resp.headers.get(k) for k in ("Server", "Content-Type") if resp.headers.get(k)},
             "ok": resp.status_code < 400,
             "snippet": snippet,
             "keyword_hits": keyword_hits,
-            "error": ""
+            "error": "",
+            "error_type": ""
         }
     except Exception as e:
         # 网络错误、SSL 错误、超时等异常路径在此兜底
@@ -110,33 +497,313 @@ def probe_url(full_url: str, timeout: int = 8, allow_redirects: bool = True, hea
             "ok": False,
             "snippet": "",
             "keyword_hits": [],
-            "error": str(e)
+            "error": str(e),
+            "error_type": error_type(e)
         }
 
 
-def scan_target(target: str, paths: List[str], timeout: int = 8, follow_redirects: bool = True, save_all: bool = False, headers: Dict[str, str] = None) -> List[Dict[str, Any]]:
+def keep_record(rec: Dict[str, Any], save_all: bool) -> bool:
+    """save_all 为 False 时仅保留成功（<400）或命中关键词的记录"""
+    return bool(save_all or rec.get("ok") or rec.get("keyword_hits"))
+
+
+def probe_path(target: str, path: str, timeout: int = 8, follow_redirects: bool = True, headers: Dict[str, str] = None,
+               session: requests.Session = None, max_body: int = DEFAULT_MAX_BODY, head_first: bool = False) -> Dict[str, Any]:
+    """探测 target 下的单个路径，返回 probe_url 的记录并补充 target / path 字段"""
+    # ensure proper join (avoid double slashes)
+    full = urljoin(target + "/", path)
+    rec = probe_url(full, timeout=timeout, allow_redirects=follow_redirects, headers=headers, session=session,
+                    max_body=max_body, head_first=head_first)
+    rec.update({"target": target, "path": path})
+    return rec
+
+
+class Fingerprint(NamedTuple):
+    """响应指纹：状态码、长度分桶、去除路径回显后的正文片段哈希"""
+    status: int
+    length_bucket: int
+    body_hash: str
+
+
+def strip_reflection(rec: Dict[str, Any]) -> Tuple[str, int]:
+    """去除正文片段中回显的 URL / 路径，返回 (片段, 去除的字符数)"""
+    snippet = rec.get("snippet") or ""
+    path = rec.get("path", "")
+    needles = {rec.get("url", ""), "/" + path, path, path.strip("/")}
+    removed = 0
+    for needle in sorted((n for n in needles if len(n) >= 3), key=len, reverse=True):
+        count = snippet.count(needle)
+        if count:
+            snippet = snippet.replace(needle, "")
+            removed += count * len(needle)
+    return snippet, removed
+
+
+def fingerprint(rec: Dict[str, Any]) -> Fingerprint:
+    """计算记录的指纹。正文中回显的 URL / 路径先被去除，长度同步扣减，避免不同路径的同一兜底页指纹不同"""
+    snippet, removed = strip_reflection(rec)
+    length = max(0, (rec.get("length") or 0) - removed)
+    digest = hashlib.sha1(snippet[:FINGERPRINT_CHARS].encode("utf-8", "replace")).hexdigest()[:16]
+    return Fingerprint(rec.get("status"), length // LENGTH_BUCKET, digest)
+
+
+class SoftNotFoundFilter:
+    """按目标校准 soft-404（对任意路径都返回成功页面的兜底响应），过滤与之匹配的记录。
+
+    - samples: 每个目标请求的随机路径数
+    - abort: True 时发现兜底响应的目标直接放弃扫描（列入跳过的目标）
+    校准时若随机路径的响应会被保留（状态码 < 400 或命中关键词），该目标视为存在兜底响应：
+    - 之后状态码与正文哈希都与兜底响应相同的记录被过滤；若兜底页每次内容不同（哈希不稳定），
+      且各样本去除回显后有足够长的公共前缀，改为按 状态码 + 长度分桶 + 正文前缀 匹配
+    - 命中关键词的记录从不过滤
+    - 该目标其余路径改用低成本模式：正文只读取 MIN_MAX_BODY 字节（足够生成片段与关键词命中）
+    """
+
+    def __init__(self, samples: int = DEFAULT_CALIBRATION_SAMPLES, abort: bool = False):
+        self.samples = max(1, samples)
+        self.abort = abort
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self.filtered: Counter = Counter()
+
+    def calibrate(self, target: str, **probe_kwargs) -> None:
+        """请求若干随机路径并记录兜底响应指纹（每个目标只校准一次）"""
+        if target in self.profiles:
+            return
+        probe_kwargs.update(max_body=MIN_MAX_BODY, head_first=False)
+        samples: Dict[int, List[Tuple[Fingerprint, str]]] = {}
+        for i in range(self.samples):
+            path = secrets.token_hex(6) + CALIBRATION_SUFFIXES[i % len(CALIBRATION_SUFFIXES)]
+            rec = probe_path(target, path, **probe_kwargs)
+            if keep_record(rec, False):
+                samples.setdefault(rec["status"], []).append((fingerprint(rec), strip_reflection(rec)[0]))
+        kept = list(dict.fromkeys(fp for items in samples.values() for fp, _ in items))
+        hashes = {(fp.status, fp.body_hash) for fp in kept}
+        # 哈希不稳定的状态码：只有各样本共享足够长的正文前缀时才启用长度分桶匹配
+        buckets = set()
+        prefixes = {}
+        for status, items in samples.items():
+            if len({fp.body_hash for fp, _ in items}) > 1:
+                prefix = os.path.commonprefix([body for _, body in items])
+                if len(prefix) >= FINGERPRINT_MIN_PREFIX:
+                    prefixes[status] = prefix
+                    buckets |= {(status, fp.length_bucket) for fp, _ in items}
+        self.profiles[target] = {"fingerprints": kept, "hashes": hashes, "buckets": buckets, "prefixes": prefixes}
+
+    def is_wildcard(self, target: str) -> bool:
+        profile = self.profiles.get(target)
+        return bool(profile and profile["fingerprints"])
+
+    def aborted(self, target: str) -> bool:
+        return self.abort and self.is_wildcard(target)
+
+    def body_cap(self, target: str, max_body: int) -> int:
+        """兜底目标改用低成本模式的正文读取上限"""
+        return min(max_body, MIN_MAX_BODY) if self.is_wildcard(target) else max_body
+
+    def matches(self, target: str, rec: Dict[str, Any]) -> bool:
+        """记录是否与目标的兜底响应匹配（匹配时计入过滤数）；命中关键词的记录从不匹配"""
+        if rec.get("keyword_hits") or not self.is_wildcard(target):
+            return False
+        profile = self.profiles[target]
+        fp = fingerprint(rec)
+        matched = (fp.status, fp.body_hash) in profile["hashes"]
+        if not matched and (fp.status, fp.length_bucket) in profile["buckets"]:
+            matched = strip_reflection(rec)[0].startswith(profile["prefixes"][fp.status])
+        if matched:
+            self.filtered[target] += 1
+        return matched
+
+    def reason(self, target: str) -> str:
+        """目标被判为兜底（过滤或放弃扫描）的原因：兜底响应的状态码与长度"""
+        return "wildcard responses: " + ", ".join(dict.fromkeys(
+            f"status {fp.status} ~{fp.length_bucket * LENGTH_BUCKET} bytes" for fp in self.profiles[target]["fingerprints"]))
+
+    def skipped(self) -> List[Dict[str, str]]:
+        """因兜底响应被放弃扫描的目标"""
+        return [{"target": t, "reason": self.reason(t)} for t in self.profiles if self.aborted(t)]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """存在兜底响应的目标、原因、其指纹与被过滤的记录数"""
+        return [{"target": t,
+                 "reason": self.reason(t),
+                 "fingerprints": [fp._asdict() for fp in p["fingerprints"]],
+                 "filtered": self.filtered[t]}
+                for t, p in self.profiles.items() if p["fingerprints"]]
+
+
+def scan_target(target: str, paths: List[str], timeout: int = 8, follow_redirects: bool = True, save_all: bool = False, headers: Dict[str, str] = None,
+                session: requests.Session = None, max_body: int = DEFAULT_MAX_BODY, head_first: bool = False,
+                breaker: CircuitBreaker = None, soft404: SoftNotFoundFilter = None) -> List[Dict[str, Any]]:
     """针对单个目标枚举字典中的路径并逐条探测。
 
     - target: 规范化后的基础 URL（不含末尾斜杠）
     - paths: 字符串路径列表，可为"目录/"或"文件"形式
     - save_all: False 时仅保留成功（<400）或命中关键词的记录；True 时全部保留
+    - session: 复用的会话（见 SessionPool）；为 None 时每个请求独立建立连接
+    - max_body / head_first: 正文读取上限与 HEAD 优先模式，见 probe_url
+    - breaker: 熔断器；目标熔断后不再探测其余路径
+    - soft404: soft-404 过滤器；扫描前校准目标，save_all 为 False 时过滤与兜底响应匹配的记录
     返回：每条路径对应的探测结果列表
     """
     results = []
+    if soft404 is not None:
+        soft404.calibrate(target, timeout=timeout, follow_redirects=follow_redirects, headers=headers, session=session)
+        if soft404.aborted(target):
+            return results
+        max_body = soft404.body_cap(target, max_body)
     for p in paths:
         p = p.strip()
         if not p:
             continue
-        # ensure proper join (avoid double slashes)
-        full = urljoin(target + "/", p)
-        rec = probe_url(full, timeout=timeout, allow_redirects=follow_redirects, headers=headers)
-        rec.update({"target": target, "path": p})
-        # if save_all is False, only save findings with status < 400 or keyword hits
-        if save_all or rec.get("ok") or rec.get("keyword_hits"):
+        if breaker is not None and breaker.is_open(target):
+            break
+        rec = probe_path(target, p, timeout=timeout, follow_redirects=follow_redirects, headers=headers, session=session,
+                         max_body=max_body, head_first=head_first)
+        if breaker is not None:
+            breaker.record(target, rec)
+        if soft404 is not None and not save_all and soft404.matches(target, rec):
+            continue
+        if keep_record(rec, save_all):
             results.append(rec)
     return results
 
 
+class _HostDispatcher:
+    """async 引擎的任务分发：每个主机（host:port）一个任务迭代器，工作协程在各主机间轮转取任务。
+
+    主机在途请求达到 per_host 时暂停向其分配任务，空闲的工作协程转而服务其他主机，
+    不会因某个慢主机占满而阻塞其余主机（队头阻塞）；该主机有请求完成后重新加入轮转。
+    """
+
+    def __init__(self, host_jobs: Dict[str, Iterator], per_host: int):
+        self.jobs = host_jobs
+        self.per_host = max(1, per_host)
+        self.active: Counter = Counter()
+        self.ready = deque(host_jobs)
+        self.changed = asyncio.Condition()
+
+    async def acquire(self) -> Optional[Tuple[str, Any]]:
+        """取下一个任务，返回 (主机, 任务)；全部任务已分发且没有在途请求时返回 None"""
+        async with self.changed:
+            while True:
+                while self.ready:
+                    host = self.ready.popleft()
+                    job = next(self.jobs[host], None)
+                    if job is None:
+                        continue
+                    self.active[host] += 1
+                    if self.active[host] < self.per_host:
+                        self.ready.append(host)
+                    return host, job
+                if not +self.active:
+                    # 没有主机会再回到轮转中，唤醒其余等待的工作协程一并退出
+                    self.changed.notify_all()
+                    return None
+                await self.changed.wait()
+
+    async def release(self, host: str):
+        """主机的一个请求结束；该主机原本满载时重新加入轮转"""
+        async with self.changed:
+            if self.active[host] >= self.per_host:
+                self.ready.append(host)
+            self.active[host] -= 1
+            self.changed.notify()
+
+    async def run(self, handle, workers: int):
+        """启动 workers 个工作协程，逐个以 await handle(任务) 处理，直到任务取尽"""
+        async def worker():
+            while True:
+                item = await self.acquire()
+                if item is None:
+                    return
+                host, job = item
+                try:
+                    await handle(job)
+                finally:
+                    await self.release(host)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+
+async def scan_targets_async(targets: List[str], paths: List[str], timeout: int = 8, follow_redirects: bool = True,
+                             save_all: bool = False, headers: Dict[str, str] = None,
+                             concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST,
+                             sessions: SessionPool = None, max_body: int = DEFAULT_MAX_BODY,
+                             head_first: bool = False, breaker: CircuitBreaker = None,
+                             soft404: SoftNotFoundFilter = None) -> List[Dict[str, Any]]:
+    """并发扫描多个目标（asyncio 调度 + 线程池执行阻塞的 requests 请求）。
+
+    - concurrency: 全局并发上限，即同时在途的请求数（工作协程数 = 线程池大小）
+    - per_host: 同一主机（host:port）的并发上限，避免压垮单个目标
+    - 每个主机一个任务迭代器（同一主机上的多个目标按"路径优先、目标轮转"排列），工作协程在
+      各主机间轮转取任务；满载的主机暂不分配，慢主机不会占住其他主机的并发名额
+    - sessions: 按目标复用连接的会话集合；为 None 时内部创建并在结束时关闭
+    - max_body / head_first: 正文读取上限与 HEAD 优先模式，见 probe_url
+    - breaker: 熔断器；目标熔断后尚未发出的路径直接跳过
+    - soft404: soft-404 过滤器；全部目标先并发校准（同样受 per_host 限制），再开始分发路径
+    记录结构与 scan_target 相同，save_all 过滤规则相同；
+    返回顺序与逐目标顺序扫描一致（先按目标，再按字典顺序）。
+    """
+    paths = [p.strip() for p in paths if p.strip()]
+    concurrency = max(1, concurrency)
+    host_targets: Dict[str, List[Tuple[int, str]]] = {}
+    for ti, t in enumerate(targets):
+        host_targets.setdefault(urlsplit(t).netloc, []).append((ti, t))
+
+    def host_jobs(items):
+        # 惰性生成，内存占用与 目标数 x 路径数 无关
+        return ((ti, pi, t, p) for pi, p in enumerate(paths) for ti, t in items)
+
+    kept = []
+    loop = asyncio.get_running_loop()
+
+    own_sessions = sessions is None
+    if own_sessions:
+        sessions = SessionPool(pool_size=max(DEFAULT_POOL_SIZE, per_host))
+
+    async def calibrate(t):
+        await loop.run_in_executor(executor, partial(
+            soft404.calibrate, t, timeout=timeout, follow_redirects=follow_redirects, headers=headers,
+            session=sessions.get(t)))
+
+    async def probe(job):
+        ti, pi, t, p = job
+        if breaker is not None and breaker.is_open(t):
+            return
+        body_cap = max_body
+        if soft404 is not None:
+            if soft404.aborted(t):
+                return
+            body_cap = soft404.body_cap(t, max_body)
+        rec = await loop.run_in_executor(executor, partial(
+            probe_path, t, p, timeout=timeout, follow_redirects=follow_redirects, headers=headers,
+            session=sessions.get(t), max_body=body_cap, head_first=head_first))
+        if breaker is not None:
+            breaker.record(t, rec)
+        if soft404 is not None and not save_all and soft404.matches(t, rec):
+            return
+        if keep_record(rec, save_all):
+            kept.append((ti, pi, rec))
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            if soft404 is not None:
+                calibration = {h: iter(dict.fromkeys(t for _, t in items)) for h, items in host_targets.items()}
+                await _HostDispatcher(calibration, per_host).run(calibrate, concurrency)
+            jobs = {h: host_jobs(items) for h, items in host_targets.items()}
+            await _HostDispatcher(jobs, per_host).run(probe, concurrency)
+    finally:
+        if own_sessions:
+            sessions.close()
+    kept.sort(key=lambda x: (x[0], x[1]))
+    return [rec for _, _, rec in kept]
+
+
+def scan_targets_concurrent(targets: List[str], paths: List[str], **kwargs) -> List[Dict[str, Any]]:
+    """scan_targets_async 的同步入口（供命令行与 MCP 服务调用）"""
+    return asyncio.run(scan_targets_async(targets, paths, **kwargs))
+
+
 def save_json(path: Path, data: List[Dict[str, Any]]):
     """将结果写入 JSON 文件，使用 UTF-8 编码并保留中文。"""
     path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -163,6 +830,18 @@ def parse_args():
     --no-redirect: 不跟随重定向（默认跟随）
     --save-all: 保存所有请求结果（包括 404）
     --user-agent: 自定义 User-Agent
+    --engine: 扫描引擎，sync 逐条顺序请求（默认），async 并发请求
+    --concurrency: async 引擎的全局并发请求数（默认 50）
+    --per-host: async 引擎中单个主机的并发请求数（默认 6）
+    --pool-size: 每个目标会话中单个主机保留的连接数（默认 10，async 引擎下不小于 --per-host）
+    --no-keep-alive: 关闭连接复用，每个请求新建连接
+    --max-body: 单个响应最多读取的正文字节数（默认 65536）
+    --head-first: 先发 HEAD，仅在状态码可能构成发现时再发 GET（其余状态无正文，错误页中的关键词会漏报）
+    --no-preflight: 不做扫描前的 DNS 解析与 TCP 存活预检
+    --max-failures: 连续连接失败多少次后熔断该目标（默认 5，0 表示不熔断）
+    --calibrate: 扫描前校准 soft-404 并过滤与兜底页面匹配的记录（默认关闭）
+    --calibration-samples: soft-404 校准时每个目标请求的随机路径数（默认 3）
+    --wildcard-abort: 对随机路径也返回成功页面的目标直接放弃扫描（隐含 --calibrate）
     """
     p = argparse.ArgumentParser(description="Dir Scan Sync - scan target for sensitive paths/files")
     p.add_argument("-t", "--target", help="single target (e.g. example.com or https://example.com)")
@@ -174,6 +853,29 @@ def parse_args():
     p.add_argument("--no-redirect", action="store_true", help="do not follow redirects")
     p.add_argument("--save-all", action="store_true", help="save all requests (including 404)")
     p.add_argument("--user-agent", default="DirScanSync/1.0")
+    p.add_argument("--engine", choices=["sync", "async"], default="sync",
+                   help="scan engine: sync (one request at a time) or async (concurrent)")
+    p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                   help=f"async engine: max concurrent requests overall (default {DEFAULT_CONCURRENCY})")
+    p.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                   help=f"async engine: max concurrent requests per host (default {DEFAULT_PER_HOST})")
+    p.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                   help=f"connections kept per host in each target's session (default {DEFAULT_POOL_SIZE})")
+    p.add_argument("--no-keep-alive", action="store_true", help="do not reuse connections between requests")
+    p.add_argument("--max-body", type=int, default=DEFAULT_MAX_BODY,
+                   help=f"max response body bytes read per request (default {DEFAULT_MAX_BODY}, min {MIN_MAX_BODY})")
+    p.add_argument("--head-first", action="store_true",
+                   help="send HEAD first and GET only when the status may be a finding (< 400, 401, 403, 405, 501); "
+                        "other responses such as 404/500 are recorded without a body, so keyword hits in them are missed")
+    p.add_argument("--no-preflight", action="store_true", help="skip the DNS/TCP liveness check before scanning")
+    p.add_argument("--max-failures", type=int, default=DEFAULT_MAX_FAILURES,
+                   help=f"skip a target after N consecutive connection failures (default {DEFAULT_MAX_FAILURES}, 0 = never)")
+    p.add_argument("--calibrate", action="store_true",
+                   help="calibrate soft-404 (catch-all) responses with random paths and filter matching records (off by default)")
+    p.add_argument("--calibration-samples", type=int, default=DEFAULT_CALIBRATION_SAMPLES,
+                   help=f"random paths requested per target for soft-404 calibration (default {DEFAULT_CALIBRATION_SAMPLES})")
+    p.add_argument("--wildcard-abort", action="store_true",
+                   help="skip targets that answer random paths with a catch-all page (implies --calibrate)")
     return p.parse_args()
 
 
@@ -181,8 +883,10 @@ def main():
     """主流程：
     1) 解析参数，收集目标集合（单个或文件批量）
     2) 准备路径字典（文件或默认）与请求头（UA）
-    3) 逐目标执行扫描，按需过滤结果
-    4) 输出 JSON，若提供 --csv 则同时输出 CSV
+    3) 预检目标（DNS 解析并缓存、TCP 存活探测），跳过不可达目标
+    4) 每个目标复用一个连接会话，逐目标执行扫描（或使用 async 引擎并发扫描全部目标），
+       连续连接失败的目标熔断；开启 --calibrate 时扫描前校准 soft-404 并过滤匹配的记录
+    5) 输出 JSON，若提供 --csv 则同时输出 CSV，并打印连接复用统计与跳过的目标
     """
     args = parse_args()
 
@@ -199,17 +903,64 @@ def main():
 
     headers = {"User-Agent": args.user_agent}
     all_results = []
-    for t in targets:
-        print(f"[+] Scanning target: {t} ...")
-        res = scan_target(t, paths, timeout=args.timeout, follow_redirects=not args.no_redirect, save_all=args.save_all, headers=headers)
-        print(f"    -> findings: {len(res)}")
-        all_results.extend(res)
+    pool_size = max(args.pool_size, args.per_host) if args.engine == "async" else args.pool_size
+    breaker = CircuitBreaker(args.max_failures)
+    soft404 = None
+    if args.calibrate or args.wildcard_abort:
+        soft404 = SoftNotFoundFilter(args.calibration_samples, abort=args.wildcard_abort)
+    skipped = []
+    resolver = ResolverCache()
+
+    def filtered_note(t):
+        n = soft404.filtered[t] if soft404 is not None else 0
+        return f" ({n} soft-404 responses filtered)" if n else ""
+
+    with SessionPool(pool_size=pool_size, keep_alive=not args.no_keep_alive, resolver=resolver) as sessions:
+        if not args.no_preflight:
+            targets, skipped = preflight_targets(targets, timeout=args.timeout, resolver=resolver)
+            print(f"[+] Pre-flight: {len(targets)}/{len(targets) + len(skipped)} target(s) reachable")
+        if args.engine == "async":
+            print(f"[+] Scanning {len(targets)} target(s) with async engine "
+                  f"(concurrency={args.concurrency}, per-host={args.per_host}) ...")
+            all_results = scan_targets_concurrent(targets, paths, timeout=args.timeout, follow_redirects=not args.no_redirect,
+                                                  save_all=args.save_all, headers=headers,
+                                                  concurrency=args.concurrency, per_host=args.per_host, sessions=sessions,
+                                                  max_body=args.max_body, head_first=args.head_first, breaker=breaker,
+                                                  soft404=soft404)
+            counts = Counter(r["target"] for r in all_results)
+            for t in targets:
+                print(f"    {t} -> findings: {counts[t]}{filtered_note(t)}")
+        else:
+            for t in targets:
+                print(f"[+] Scanning target: {t} ...")
+                res = scan_target(t, paths, timeout=args.timeout, follow_redirects=not args.no_redirect, save_all=args.save_all, headers=headers,
+                                  session=sessions.get(t), max_body=args.max_body, head_first=args.head_first, breaker=breaker,
+                                  soft404=soft404)
+                sessions.release(t)
+                print(f"    -> findings: {len(res)}{filtered_note(t)}")
+                all_results.extend(res)
+        conn = sessions.stats()
+    skipped += breaker.skipped()
+    if soft404 is not None:
+        skipped += soft404.skipped()
 
     outpath = Path(args.out)
     save_json(outpath, all_results)
     if args.csv:
         save_csv(Path(args.csv), all_results)
     print(f"[+] Scan finished. {len(all_results)} records saved to {outpath}")
+    print(f"[+] Connections: {conn['connections']} opened for {conn['requests']} requests "
+          f"(reuse ratio {conn['reuse_ratio']:.1%})")
+    if soft404 is not None and soft404.summary():
+        wildcard = soft404.summary()
+        print(f"[+] Soft-404: {len(wildcard)} target(s) answer random paths with a catch-all page, "
+              f"{sum(w['filtered'] for w in wildcard)} matching responses filtered")
+        for w in wildcard:
+            print(f"    {w['target']}: {w['filtered']} filtered ({w['reason']})")
+    if skipped:
+        print(f"[!] Skipped {len(skipped)} target(s):")
+        for item in skipped:
+            print(f"    {item['target']}: {item['reason']}")
 
 
 if __name__ == "__main__":
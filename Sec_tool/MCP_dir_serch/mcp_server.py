@@ -6,17 +6,30 @@ MCP Server for Directory Scanner
 
 import json
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 # 导入 dir_serch 的核心功能
 from dir_serch import (
+    DEFAULT_CALIBRATION_SAMPLES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_BODY,
+    DEFAULT_MAX_FAILURES,
+    DEFAULT_PER_HOST,
+    DEFAULT_POOL_SIZE,
     DEFAULT_WORDLIST,
+    CircuitBreaker,
+    ResolverCache,
+    SessionPool,
+    SoftNotFoundFilter,
+    preflight_targets,
     normalize_target,
     load_wordlist,
     load_targets,
     scan_target,
+    scan_targets_concurrent,
     save_json,
     save_csv,
 )
@@ -130,6 +143,69 @@ class MCPServer:
                                 "description": "自定义 User-Agent（可选）",
                                 "default": "DirScanSync/1.0"
                             },
+                            "engine": {
+                                "type": "string",
+                                "enum": ["sync", "async"],
+                                "description": "扫描引擎：sync 逐条顺序请求，async 并发请求（默认 sync）",
+                                "default": "sync"
+                            },
+                            "concurrency": {
+                                "type": "integer",
+                                "description": f"async 引擎的全局并发请求数（默认 {DEFAULT_CONCURRENCY}）",
+                                "default": DEFAULT_CONCURRENCY
+                            },
+                            "per_host": {
+                                "type": "integer",
+                                "description": f"async 引擎中单个主机的并发请求数（默认 {DEFAULT_PER_HOST}）",
+                                "default": DEFAULT_PER_HOST
+                            },
+                            "pool_size": {
+                                "type": "integer",
+                                "description": f"每个目标会话中单个主机保留的连接数（默认 {DEFAULT_POOL_SIZE}，async 引擎下不小于 per_host）",
+                                "default": DEFAULT_POOL_SIZE
+                            },
+                            "keep_alive": {
+                                "type": "boolean",
+                                "description": "是否复用连接（keep-alive，默认 true）",
+                                "default": True
+                            },
+                            "max_body": {
+                                "type": "integer",
+                                "description": f"单个响应最多读取的正文字节数（默认 {DEFAULT_MAX_BODY}）",
+                                "default": DEFAULT_MAX_BODY
+                            },
+                            "head_first": {
+                                "type": "boolean",
+                                "description": "先发 HEAD，仅在状态码可能构成发现（< 400、401/403/405/501）时再发 GET；"
+                                               "其余状态（如 404、500）不读取正文，错误页中的关键词不会被检出（默认 false）",
+                                "default": False
+                            },
+                            "preflight": {
+                                "type": "boolean",
+                                "description": "扫描前预检目标（DNS 解析并缓存、TCP 存活探测），跳过不可达目标（默认 true）",
+                                "default": True
+                            },
+                            "max_failures": {
+                                "type": "integer",
+                                "description": f"连续连接失败多少次后熔断该目标、跳过其余路径（默认 {DEFAULT_MAX_FAILURES}，0 表示不熔断）",
+                                "default": DEFAULT_MAX_FAILURES
+                            },
+                            "calibrate": {
+                                "type": "boolean",
+                                "description": "扫描前请求随机路径校准 soft-404（兜底页面）并过滤匹配的记录；"
+                                               "被过滤的记录数与原因见 summary.soft_404（默认 false）",
+                                "default": False
+                            },
+                            "calibration_samples": {
+                                "type": "integer",
+                                "description": f"soft-404 校准时每个目标请求的随机路径数（默认 {DEFAULT_CALIBRATION_SAMPLES}）",
+                                "default": DEFAULT_CALIBRATION_SAMPLES
+                            },
+                            "wildcard_abort": {
+                                "type": "boolean",
+                                "description": "对随机路径也返回成功页面的目标直接放弃扫描，隐含 calibrate（默认 false）",
+                                "default": False
+                            },
                             "output_json": {
                                 "type": "string",
                                 "description": "JSON 输出文件路径（可选，不提供则不保存文件）"
@@ -203,30 +279,86 @@ class MCPServer:
         timeout = args.get("timeout", 8)
         follow_redirects = args.get("follow_redirects", True)
         save_all = args.get("save_all", False)
+        max_body = args.get("max_body", DEFAULT_MAX_BODY)
+        head_first = args.get("head_first", False)
         
         # 执行扫描
         all_results = []
         scan_summary = []
         total_keyword_hits = 0
         
-        for target in targets:
-            results = scan_target(
-                target=target,
-                paths=paths,
-                timeout=timeout,
-                follow_redirects=follow_redirects,
-                save_all=save_all,
-                headers=headers
-            )
-            all_results.extend(results)
-            # 统计关键词命中
-            for r in results:
-                if r.get("keyword_hits"):
-                    total_keyword_hits += 1
-            scan_summary.append({
-                "target": target,
-                "findings_count": len(results)
-            })
+        engine = args.get("engine", "sync")
+        per_host = args.get("per_host", DEFAULT_PER_HOST)
+        pool_size = args.get("pool_size", DEFAULT_POOL_SIZE)
+        if engine == "async":
+            pool_size = max(pool_size, per_host)
+        
+        breaker = CircuitBreaker(args.get("max_failures", DEFAULT_MAX_FAILURES))
+        soft404 = None
+        if args.get("calibrate", False) or args.get("wildcard_abort", False):
+            soft404 = SoftNotFoundFilter(args.get("calibration_samples", DEFAULT_CALIBRATION_SAMPLES),
+                                         abort=args.get("wildcard_abort", False))
+        skipped_targets = []
+        
+        # DNS 缓存只作用于本次扫描的预检与会话，不影响服务进程中的其他请求
+        resolver = ResolverCache()
+        with SessionPool(pool_size=pool_size, keep_alive=args.get("keep_alive", True), resolver=resolver) as sessions:
+            # 预检：不可达目标不参与扫描
+            if args.get("preflight", True):
+                targets, skipped_targets = preflight_targets(targets, timeout=timeout, resolver=resolver)
+            if engine == "async":
+                all_results = scan_targets_concurrent(
+                    targets,
+                    paths,
+                    timeout=timeout,
+                    follow_redirects=follow_redirects,
+                    save_all=save_all,
+                    headers=headers,
+                    concurrency=args.get("concurrency", DEFAULT_CONCURRENCY),
+                    per_host=per_host,
+                    sessions=sessions,
+                    max_body=max_body,
+                    head_first=head_first,
+                    breaker=breaker,
+                    soft404=soft404
+                )
+                counts = Counter(r["target"] for r in all_results)
+                for target in targets:
+                    scan_summary.append({
+                        "target": target,
+                        "findings_count": counts[target],
+                        "soft_404_filtered": soft404.filtered[target] if soft404 is not None else 0
+                    })
+            else:
+                for target in targets:
+                    results = scan_target(
+                        target=target,
+                        paths=paths,
+                        timeout=timeout,
+                        follow_redirects=follow_redirects,
+                        save_all=save_all,
+                        headers=headers,
+                        session=sessions.get(target),
+                        max_body=max_body,
+                        head_first=head_first,
+                        breaker=breaker,
+                        soft404=soft404
+                    )
+                    sessions.release(target)
+                    all_results.extend(results)
+                    scan_summary.append({
+                        "target": target,
+                        "findings_count": len(results),
+                        "soft_404_filtered": soft404.filtered[target] if soft404 is not None else 0
+                    })
+            connection_stats = sessions.stats()
+        skipped_targets += breaker.skipped()
+        if soft404 is not None:
+            skipped_targets += soft404.skipped()
+        # 统计关键词命中
+        for r in all_results:
+            if r.get("keyword_hits"):
+                total_keyword_hits += 1
         
         # 保存文件（如果指定）
         output_info = {}
@@ -262,7 +394,11 @@ class MCPServer:
                 "targets_scanned": len(targets),
                 "total_findings": len(all_results),
                 "targets": scan_summary,
-                "keyword_hit_records": total_keyword_hits
+                "keyword_hit_records": total_keyword_hits,
+                "connections": connection_stats,
+                "skipped_targets": skipped_targets,
+                "soft_404_filtered": sum(soft404.filtered.values()) if soft404 is not None else 0,
+                "soft_404": soft404.summary() if soft404 is not None else []
             },
             "results": all_results,
             "output_files": output_info
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dir_serch 回归测试：soft-404 过滤不能吞掉真实发现
+
+在本地启动一个对任意路径返回 200 兜底页（每次带随机数）的 HTTP 服务，
+其中只有 /.git/config 与 /.env 是真实文件，且长度与兜底页落在同一长度分桶。
+
+运行：python3 -m pytest test_dir_serch.py
+"""
+
+import secrets
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import dir_serch
+
+CATCH_ALL = "<html><head><title>Portal</title></head><body>Page not found, request id {nonce}</body></html>"
+GIT_CONFIG = "[core]\n\trepositoryformatversion = 0\n\tfilemode = true\n\tbare = false\n"
+ENV = "APP_ENV=prod\nDB_PASSWORD=hunter2\n"
+
+
+def _pad(body, length):
+    return body + "#" * (length - len(body))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 才支持连接保持，见 test_session_hooks
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        length = len(CATCH_ALL.format(nonce=secrets.token_hex(8)))
+        files = {"/.git/config": _pad(GIT_CONFIG, length), "/.env": _pad(ENV, length)}
+        body = files.get(self.path) or CATCH_ALL.format(nonce=secrets.token_hex(8))
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@contextmanager
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="module")
+def target():
+    with _serve(_Handler) as url:
+        yield url
+
+
+def test_short_file_next_to_catch_all(target):
+    """长度与兜底页相近、但正文不同的文件不被过滤，兜底页本身被过滤"""
+    soft404 = dir_serch.SoftNotFoundFilter()
+    results = dir_serch.scan_target(target, [".git/config", ".env", "admin/", "backup.zip"], timeout=5,
+                                    soft404=soft404)
+    assert [r["path"] for r in results] == [".git/config", ".env"]
+    assert results[0]["snippet"].startswith("[core]")
+    assert soft404.filtered[target] == 2
+
+
+def test_keyword_hits_never_filtered(target):
+    """命中关键词的记录即使与兜底页指纹相同也不过滤"""
+    soft404 = dir_serch.SoftNotFoundFilter()
+    soft404.calibrate(target, timeout=5)
+    rec = dir_serch.probe_path(target, "missing", timeout=5)
+    assert soft404.matches(target, dict(rec))
+    assert not soft404.matches(target, dict(rec, keyword_hits=["password"]))
+
+
+def test_slow_host_does_not_block_others():
+    """慢主机占满 per_host 名额时，其余工作协程继续服务其他主机（无队头阻塞）"""
+    paths = [f"p{i}" for i in range(4)]
+    fast_done = threading.Event()
+    fast_hits = []
+    slow_waits = []
+
+    class Fast(_Handler):
+        def do_GET(self):
+            fast_hits.append(self.path)
+            if len(fast_hits) == len(paths):
+                fast_done.set()
+            super().do_GET()
+
+    class Slow(_Handler):
+        def do_GET(self):
+            # 快主机的全部路径完成前不应答；超时说明快主机被慢主机的任务堵住
+            slow_waits.append(fast_done.wait(timeout=3))
+            super().do_GET()
+
+    with _serve(Slow) as slow, _serve(Fast) as fast:
+        results = dir_serch.scan_targets_concurrent([slow, fast], paths, timeout=10, save_all=True,
+                                                    concurrency=4, per_host=1)
+    assert [(r["target"], r["path"]) for r in results] == [(t, p) for t in (slow, fast) for p in paths]
+    assert slow_waits and all(slow_waits)
+
+
+class _FlakyHandler(_Handler):
+    """/loop 无限重定向，/slow 迟迟不发响应头，/stall 发完响应头后正文停住，其余路径同 _Handler"""
+
+    def do_GET(self):
+        if self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/slow":
+            time.sleep(1)
+        elif self.path == "/stall":
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.flush()
+            time.sleep(1)
+        else:
+            super().do_GET()
+
+
+def test_breaker_ignores_reachable_host_errors():
+    """重定向循环、读超时不计入连接失败，目标不熔断，健康路径照常探测"""
+    paths = ["loop", "slow", "stall"] * 2 + [".git/config"]
+    breaker = dir_serch.CircuitBreaker(max_failures=2)
+    with _serve(_FlakyHandler) as flaky:
+        results = dir_serch.scan_target(flaky, paths, timeout=0.5, save_all=True, breaker=breaker)
+    assert [r["error_type"] for r in results] == ["TooManyRedirects", "ReadTimeout", "ReadTimeout"] * 2 + [""]
+    assert results[-1]["status"] == 200
+    assert not breaker.is_open(flaky)
+
+
+def test_breaker_trips_on_connection_failures():
+    """端口不可连接时连续失败达到阈值即熔断"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    breaker = dir_serch.CircuitBreaker(max_failures=2)
+    results = dir_serch.scan_target(dead, ["a", "b", "c"], timeout=1, save_all=True, breaker=breaker)
+    assert [r["error_type"] for r in results] == ["ConnectionError", "ConnectionError"]
+    assert breaker.is_open(dead)
+
+
+class _CountingResolver(dir_serch.ResolverCache):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def getaddrinfo(self, *args, **kwargs):
+        self.calls += 1
+        return super().getaddrinfo(*args, **kwargs)
+
+
+@pytest.mark.parametrize("keep_alive", [True, False])
+def test_session_hooks(target, keep_alive):
+    """连接计数与 DNS 缓存的挂接生效：复用时只建一次连接，每次新建连接都经 resolver 解析"""
+    resolver = _CountingResolver()
+    paths = [".git/config", ".env", "admin/", "backup.zip"]
+    with dir_serch.SessionPool(keep_alive=keep_alive, resolver=resolver) as sessions:
+        results = dir_serch.scan_target(target, paths, timeout=5, save_all=True, session=sessions.get(target))
+        stats = sessions.stats()
+    assert [r["status"] for r in results] == [200] * len(paths)
+    assert stats["requests"] == len(paths)
+    assert stats["connections"] == (1 if keep_alive else len(paths))
+    assert resolver.calls == stats["connections"]
+    assert len(resolver._cache) == 1
+
+
+def test_missing_urllib3_hooks(monkeypatch):
+    """挂接所需的 urllib3 内部方法缺失时立即报错，而不是记录为请求错误"""
+    monkeypatch.delattr(dir_serch.HTTPConnectionPool, "_validate_conn")
+    with pytest.raises(RuntimeError, match="urllib3"):
+        dir_serch.SessionPool().get("http://127.0.0.1")
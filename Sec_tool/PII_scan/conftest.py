@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PII_scan 测试共用的夹具：检测器、样例号码与混合语料
+"""
+
+import random
+
+import pytest
+
+from pii_scan import PiiScanner
+
+CARD = "6224 8848 5647 9757"
+ID_NUMBER = "11010519491231002X"
+
+
+@pytest.fixture(scope="session")
+def scanner():
+    return PiiScanner.from_default_tables()
+
+
+@pytest.fixture(scope="session")
+def card():
+    """分组书写的合法银行卡号"""
+    return CARD
+
+
+@pytest.fixture(scope="session")
+def id_number():
+    """合法的 18 位身份证号（校验位为 X）"""
+    return ID_NUMBER
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """约 2000 行的混合语料：金额后紧跟卡号、横杠卡号、分组身份证号、长数字等"""
+    rng = random.Random(1)
+    lines = []
+    for _ in range(2000):
+        lines.append(rng.choice([
+            f"amount {rng.randrange(10000):04d} {CARD}",
+            f"card {CARD.replace(' ', '-')}",
+            f"id:{ID_NUMBER}",
+            f"{ID_NUMBER[:6]} {ID_NUMBER[6:14]} {ID_NUMBER[14:]}",
+            f"ts {rng.randrange(10 ** 12, 10 ** 13)}",
+            "lorem ipsum",
+        ]))
+    return "\n".join(lines).encode()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+敏感信息脱敏改写工具
+-----------------------------------------
+功能：
+1. 流式读取输入文件，把其中通过完整检测的身份证号、银行卡号按策略打码后写出副本
+2. 候选发现与检测复用 pii_scan.PiiScanner（单次扫描、校验位预筛、完整检测）
+3. 按块处理，块尾保留一段未写出的数据与下一块拼接，跨块的号码同样能被识别和打码
+4. 打码只替换数字位、保留空格和横杠，输出与输入逐字节等长（偏移不变）
+
+脱敏策略：
+- keep:N:M   保留前 N 位和后 M 位数字（银行卡默认 keep:6:4）
+- birthday   只遮盖身份证号中的出生日期（身份证默认）
+- full       遮盖全部数字
+
+用法：
+    python3 pii_redact.py dump.sql -o dump_masked.sql
+    python3 pii_redact.py logs/ --out-dir masked/ --card-policy keep:0:4 --id-policy full
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pii_scan import BLOCK_OVERLAP, KIND_CARD, KIND_ID, PiiScanner, iter_files
+
+# 每次读取的块大小
+CHUNK_SIZE = 16 << 20
+
+DEFAULT_CARD_POLICY = "keep:6:4"
+DEFAULT_ID_POLICY = "birthday"
+DEFAULT_MASK_CHAR = "*"
+
+
+def mask_digits(value: str, start: int, end: int, mask_char: str = DEFAULT_MASK_CHAR) -> str:
+    """把第 start 到 end-1 个数字位（X 视为数字位，分隔符不计）替换为 mask_char"""
+    out = []
+    index = 0
+    for ch in value:
+        if ch in " -":
+            out.append(ch)
+            continue
+        out.append(mask_char if start <= index < end else ch)
+        index += 1
+    return "".join(out)
+
+
+def build_masker(policy: str, kind: str, mask_char: str = DEFAULT_MASK_CHAR) -> Callable[[str], str]:
+    """
+    解析脱敏策略，返回 value -> 打码后字符串 的函数
+
+    策略格式见模块说明；birthday 仅适用于身份证号（18 位遮盖第 7-14 位，15 位遮盖第 7-12 位）
+    """
+    name, _, args = policy.partition(":")
+    if name == "full":
+        return lambda v: mask_digits(v, 0, len(v), mask_char)
+    if name == "birthday":
+        if kind != KIND_ID:
+            raise ValueError("birthday 策略仅适用于身份证号")
+
+        def mask_birthday(v: str) -> str:
+            digit_count = sum(1 for ch in v if ch not in " -")
+            return mask_digits(v, 6, 14 if digit_count == 18 else 12, mask_char)
+        return mask_birthday
+    if name == "keep":
+        try:
+            head, tail = (int(x) for x in args.split(":"))
+        except ValueError:
+            raise ValueError(f"脱敏策略格式错误：{policy}（应为 keep:N:M）")
+        if head < 0 or tail < 0:
+            raise ValueError(f"脱敏策略格式错误：{policy}（N、M 不能为负数）")
+
+        def mask_keep(v: str) -> str:
+            digit_count = sum(1 for ch in v if ch not in " -")
+            return mask_digits(v, head, max(head, digit_count - tail), mask_char)
+        return mask_keep
+    raise ValueError(f"未知的脱敏策略：{policy}")
+
+
+class Redactor:
+    """按块流式改写：发现号码后按类型调用对应的打码函数"""
+
+    def __init__(self, scanner: PiiScanner, maskers: Dict[str, Callable[[str], str]],
+                 chunk_size: int = CHUNK_SIZE):
+        self.scanner = scanner
+        self.maskers = maskers
+        self.chunk_size = chunk_size
+        self.bytes = 0
+        self.masked = {KIND_ID: 0, KIND_CARD: 0}
+
+    def redact_stream(self, src, dst, path: str = "") -> int:
+        """
+        从 src 读取、向 dst 写出打码后的数据，返回本文件打码条数
+
+        每轮把"前一字节 + 上轮未写出的尾部 + 新数据"拼成一块，只处理起点在
+        [前一字节之后, 块尾 - BLOCK_OVERLAP) 内的候选；尾部留到下一轮，
+        保证跨块的号码完整。文件结束时处理到块尾。
+        """
+        prev = b""       # 已写出的最后 1 字节，用于判断候选前一个字符
+        pending = b""    # 尚未写出的数据
+        offset = 0       # pending 第一个字节在文件中的偏移
+        count = 0
+        eof = False
+        while not eof:
+            data = src.read(self.chunk_size)
+            eof = not data
+            block = prev + pending + data
+            lo = len(prev)
+            hi = len(block) if eof else max(lo, len(block) - BLOCK_OVERLAP)
+            base = offset - lo
+            findings = self.scanner.scan_block(block, lo, hi, base, path)
+
+            pieces = []
+            cut = lo
+            for f in findings:
+                start = f.offset - base
+                pieces.append(block[cut:start])
+                pieces.append(self.maskers[f.kind](f.value).encode("ascii"))
+                cut = start + f.length
+                self.masked[f.kind] += 1
+            count += len(findings)
+            end = max(cut, hi)
+            pieces.append(block[cut:end])
+            dst.write(b"".join(pieces))
+
+            self.bytes += end - lo
+            offset += end - lo
+            prev = block[end - 1:end]
+            pending = block[end:]
+        return count
+
+    def redact_file(self, src_path: Path, dst_path: Path) -> int:
+        """改写单个文件：先写入同目录临时文件，完成后再替换为目标文件"""
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dst_path.with_name(f".{dst_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(src_path, "rb") as src, open(tmp_path, "wb") as dst:
+                count = self.redact_stream(src, dst, str(src_path))
+            os.replace(tmp_path, dst_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return count
+
+
+def plan_outputs(paths: List[str], output: str, out_dir: str) -> List[Tuple[Path, Path]]:
+    """
+    确定每个输入文件对应的输出路径：单个文件可用 -o，其余按相对路径写入 --out-dir
+
+    文件输入写到 out_dir/文件名，目录输入写到 out_dir/目录名/相对路径；
+    不同输入落到同一输出路径（如 a/log.txt 与 b/log.txt）时抛出 ValueError，
+    同一文件重复指定时只处理一次。
+    """
+    if output:
+        return [(Path(paths[0]), Path(output))]
+    root = Path(out_dir)
+    plan = []
+    sources: Dict[Path, Path] = {}
+    conflicts = []
+    for p in map(Path, paths):
+        for fp in iter_files([str(p)]):
+            dst = root / p.name / fp.relative_to(p) if p.is_dir() else root / fp.name
+            prev = sources.setdefault(dst, fp)
+            if prev is not fp:
+                if prev.resolve() != fp.resolve():
+                    conflicts.append(f"{prev}、{fp} -> {dst}")
+                continue
+            plan.append((fp, dst))
+    if conflicts:
+        raise ValueError("多个输入文件会写到同一输出路径，请分开处理或改名：\n    "
+                         + "\n    ".join(conflicts))
+    return plan
+
+
+def nested_input_dir(paths: List[str], out_dir: str) -> Optional[Path]:
+    """返回包含 out_dir（或与之相同）的输入目录；没有则返回 None"""
+    out = Path(out_dir).resolve()
+    for p in map(Path, paths):
+        if p.is_dir():
+            d = p.resolve()
+            if out == d or d in out.parents:
+                return p
+    return None
+
+
+# ==========================================================
+# 主执行逻辑
+# ==========================================================
+def parse_args():
+    p = argparse.ArgumentParser(description="身份证号 / 银行卡号脱敏改写工具")
+    p.add_argument("paths", nargs="+", help="输入文件或目录（目录递归处理）")
+    p.add_argument("-o", "--output", help="输出文件（仅适用于单个输入文件）")
+    p.add_argument("--out-dir", help="输出目录，按输入文件名（目录保留相对路径）写出")
+    p.add_argument("--card-policy", default=DEFAULT_CARD_POLICY,
+                   help=f"银行卡号脱敏策略：keep:N:M / full（默认 {DEFAULT_CARD_POLICY}）")
+    p.add_argument("--id-policy", default=DEFAULT_ID_POLICY,
+                   help=f"身份证号脱敏策略：birthday / keep:N:M / full（默认 {DEFAULT_ID_POLICY}）")
+    p.add_argument("--mask-char", default=DEFAULT_MASK_CHAR, help="打码字符，须为单个 ASCII 字符（默认 *）")
+    p.add_argument("-r", "--region-file", action="append",
+                   help="行政区码表文件（默认 ID_cards/region_codes.xlsx）；可重复指定多个历史版本")
+    args = p.parse_args()
+    if bool(args.output) == bool(args.out_dir):
+        p.error("请指定 -o（单个文件）或 --out-dir 之一")
+    if args.output and (len(args.paths) != 1 or not Path(args.paths[0]).is_file()):
+        p.error("-o 仅适用于单个输入文件，多个文件或目录请使用 --out-dir")
+    if len(args.mask_char) != 1 or not args.mask_char.isascii():
+        p.error("--mask-char 须为单个 ASCII 字符")
+    if args.out_dir:
+        nested = nested_input_dir(args.paths, args.out_dir)
+        if nested is not None:
+            p.error(f"--out-dir 不能位于输入目录 {nested} 之内（输出会被当作输入再次处理）")
+    return args
+
+
+def main():
+    args = parse_args()
+    try:
+        maskers = {
+            KIND_CARD: build_masker(args.card_policy, KIND_CARD, args.mask_char),
+            KIND_ID: build_masker(args.id_policy, KIND_ID, args.mask_char),
+        }
+        scanner = PiiScanner.from_default_tables(args.region_file)
+    except ValueError as e:
+        print(f"[错误] {e}")
+        sys.exit(1)
+
+    try:
+        plan = plan_outputs(args.paths, args.output, args.out_dir)
+    except ValueError as e:
+        print(f"[错误] {e}")
+        sys.exit(1)
+
+    redactor = Redactor(scanner, maskers)
+    start = time.perf_counter()
+    files = 0
+    for src_path, dst_path in plan:
+        if dst_path.exists() and dst_path.resolve() == src_path.resolve():
+            print(f"[警告] 输出与输入为同一文件，已跳过：{src_path}")
+            continue
+        try:
+            count = redactor.redact_file(src_path, dst_path)
+        except OSError as e:
+            print(f"[警告] 处理失败，已跳过：{src_path}（{e}）")
+            continue
+        files += 1
+        print(f"[信息] {src_path} -> {dst_path}：打码 {count} 处")
+
+    elapsed = time.perf_counter() - start
+    speed = redactor.bytes / elapsed / (1 << 20) if elapsed > 0 else 0.0
+    print(f"[完成] 脱敏完成！")
+    print(f"    - 文件：{files} 个，{redactor.bytes / (1 << 20):.1f} MB，{speed:.1f} MB/秒")
+    print(f"    - 身份证号：{redactor.masked[KIND_ID]} 处")
+    print(f"    - 银行卡号：{redactor.masked[KIND_CARD]} 处")
+
+
+if __name__ == "__main__":
+    main()
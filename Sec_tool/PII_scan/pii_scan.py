@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+敏感信息（身份证号 / 银行卡号）发现工具
+-----------------------------------------
+功能：
+1. 对任意文件（日志、数据库导出、文档等）单次扫描，同时发现身份证号和银行卡号
+2. 以 mmap 映射文件并分块扫描，内存占用与文件大小无关；每块先映射为字符类别，
+   再用以字面量开头的正则快速定位候选片段（连续数字、分组卡号、分组身份证号）
+3. 先做低成本的校验位预筛（身份证 GB 11643 校验位、银行卡批量 Luhn），
+   通过后再调用 ID_card.check_id_card / bank_id 的完整检测逻辑
+4. 输出每条发现的文件、字节偏移、类型和取值（TSV 或 JSON Lines）
+
+依赖同级目录的 ID_cards/ID_card.py 与 Bank_ID/bank_id.py（直接复用其检测逻辑）。
+
+用法：
+    python3 pii_scan.py dump.sql logs/ -o findings.tsv
+    python3 pii_scan.py export.csv -o findings.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+TOOL_DIR = BASE_DIR.parent
+sys.path[:0] = [str(TOOL_DIR), str(TOOL_DIR / "ID_cards"), str(TOOL_DIR / "Bank_ID")]
+
+import ID_card  # noqa: E402
+import bank_id  # noqa: E402
+from luhn_kernel import luhn_check_many  # noqa: E402
+
+# 扫描前先把每块字节映射为字符类别：数字 -> "0"，X/x -> "X"，其他字母 -> "a"，
+# 空格和横杠 -> "-"，其余 -> "."。候选正则都以字面量前缀开头，re 可以用快速的
+# 字面量查找跳过无关内容，而不必在每个位置尝试匹配。
+_CLASS_TABLE = bytes(
+    ord("0") if chr(c).isdigit() and c < 128
+    else ord("X") if chr(c) in "Xx"
+    else ord("a") if chr(c).isascii() and chr(c).isalpha()
+    else ord("-") if chr(c) in " -"
+    else ord(".")
+    for c in range(256)
+)
+_WORD_CLASSES = b"0Xa"
+
+# 候选片段（前后不能紧邻字母或数字）：
+# - digits：13-19 位连续数字，或 17 位数字 + X（身份证号或银行卡号）
+# - card：4 位一组、以空格或横杠分隔的卡号
+# - id：6-8-4 分组书写的身份证号
+# 前一个字符用放在字面量前缀之后的反向断言检查：既保留 re 的前缀快速查找，
+# 又不会像匹配后再检查那样，被拒绝的片段整段跳过而漏掉其中重新开始的号码。
+_CANDIDATE_RES = [
+    ("digits", re.compile(rb"0000000000000(?<![0Xa]0000000000000)[0]*X?")),
+    ("card", re.compile(rb"0000-0000-0000(?<![0Xa]0000-0000-0000)(?:-0000)?(?:-0{1,3})?(?![0Xa])")),
+    ("id", re.compile(rb"000000(?<![0Xa]000000)-00000000-000[0X](?![0Xa])")),
+]
+# 每次扫描的块大小；相邻块重叠 BLOCK_OVERLAP 字节（需大于最长候选片段 23 字节），
+# 保证跨块的候选片段完整
+BLOCK_SIZE = 16 << 20
+BLOCK_OVERLAP = 64
+
+KIND_ID = "id_card"
+KIND_CARD = "bank_card"
+
+RESULT_HEADER = "文件\t偏移\t长度\t类型\t值\t详情\n"
+
+
+class Finding(NamedTuple):
+    """一条发现：偏移与长度均以字节计"""
+    path: str
+    offset: int
+    length: int
+    kind: str
+    value: str
+    detail: str
+
+
+class ScanStats:
+    """扫描计数：候选片段、通过预筛、确认的发现"""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.candidates = 0
+        self.prefiltered = 0
+        self.by_kind = {KIND_ID: 0, KIND_CARD: 0}
+
+
+class PiiScanner:
+    """
+    单次扫描同时发现身份证号和银行卡号
+
+    region_dict 为 load_region_codes 的结果或 RegionIndex，
+    validator 为 bank_id.BankCardValidator。
+    """
+
+    def __init__(self, region_dict, validator, current_year: Optional[int] = None):
+        self.region_dict = region_dict
+        self.validator = validator
+        self.current_year = current_year if current_year is not None else ID_card.refresh_current_year()
+        self.stats = ScanStats()
+
+    @classmethod
+    def from_default_tables(cls, region_files: Optional[List[str]] = None) -> "PiiScanner":
+        """从 ID_cards / Bank_ID 目录下的默认数据表构建扫描器"""
+        region_files = region_files or [str(TOOL_DIR / "ID_cards" / "region_codes.xlsx")]
+        with contextlib.redirect_stdout(io.StringIO()):
+            region_index = ID_card.RegionIndex.from_files(region_files)
+            validator = bank_id.BankCardValidator.from_files(
+                TOOL_DIR / "Bank_ID" / "src" / "banks.ts", TOOL_DIR / "Bank_ID" / "src" / "bin.ts")
+        return cls(region_index, validator)
+
+    def _check_id(self, digits: str) -> Optional[str]:
+        """身份证号：18 位先比对校验位，通过后做完整检测；返回详情或 None"""
+        if len(digits) == 18 and ID_card.calc_check_digit(digits[:17]) != digits[17]:
+            return None
+        self.stats.prefiltered += 1
+        res = ID_card.check_id_card(digits, self.region_dict, self.current_year)
+        if not res["is_valid"]:
+            return None
+        return f"{res['region']} {res['birthday']} {res['gender']}"
+
+    def _check_card(self, digits: str) -> Optional[str]:
+        """银行卡号：已通过 Luhn 预筛，匹配 BIN 等其余规则；返回详情或 None"""
+        self.stats.prefiltered += 1
+        r = self.validator.check(digits)
+        if not r.is_valid:
+            return None
+        return f"{r.bank} {r.card_type}"
+
+    def _candidates(self, classes: bytes, lo: int, hi: int) -> List[tuple]:
+        """在类别映射后的块中找出起点位于 [lo, hi) 的候选片段，返回 (起点, 终点, 种类) 列表"""
+        found = []
+        for kind, pattern in _CANDIDATE_RES:
+            pos = lo
+            while True:
+                m = pattern.search(classes, pos)
+                if m is None or m.start() >= hi:
+                    break
+                start, end = m.span()
+                # 分组卡号可能从上一个候选的某一组重新开始（如"金额 1000 6224 8848 5647 9757"），
+                # 因此从下一位置继续查找；其余两种候选内部不可能有新的起点
+                pos = start + 1 if kind == "card" else end
+                if kind == "digits":
+                    length = end - start
+                    if length > 19 or (classes[end - 1] == 88 and length != 18):  # 88 == ord("X")
+                        continue
+                    if end < len(classes) and classes[end] in _WORD_CLASSES:
+                        continue
+                found.append((start, end, kind))
+        found.sort()
+        return found
+
+    def scan_block(self, block: bytes, lo: int, hi: int, base: int = 0, path: str = "") -> List[Finding]:
+        """扫描一块数据中起点位于 [lo, hi) 的候选片段，base 为块在文件中的偏移"""
+        stats = self.stats
+        candidates = self._candidates(block.translate(_CLASS_TABLE), lo, hi)
+        stats.candidates += len(candidates)
+
+        findings = []
+        cards = []
+        for start, end, kind in candidates:
+            raw = block[start:end].decode("ascii")
+            digits = raw.replace(" ", "").replace("-", "").upper()
+            if kind == "id" or (kind == "digits" and len(digits) in (15, 18)):
+                # 15 / 18 位纯数字既可能是身份证号也可能是银行卡号，优先按身份证号检测
+                detail = self._check_id(digits)
+                if detail is not None:
+                    findings.append(Finding(path, base + start, end - start, KIND_ID, raw, detail))
+                    continue
+                if not digits.isdigit():
+                    continue
+            cards.append((start, end, raw, digits))
+
+        # 银行卡候选先整批做 Luhn 预筛（数量多时使用 numpy 后端）
+        luhn_mask = luhn_check_many([c[3] for c in cards])
+        for (start, end, raw, digits), ok in zip(cards, luhn_mask):
+            if ok:
+                detail = self._check_card(digits)
+                if detail is not None:
+                    findings.append(Finding(path, base + start, end - start, KIND_CARD, raw, detail))
+
+        # 分组卡号的候选可能互相重叠，按起点顺序只保留不落在前一条发现内的
+        findings.sort(key=lambda f: f.offset)
+        kept = []
+        covered = 0
+        for f in findings:
+            if f.offset < covered:
+                continue
+            kept.append(f)
+            covered = f.offset + f.length
+            stats.by_kind[f.kind] += 1
+        return kept
+
+    def scan_buffer(self, buf, path: str = "") -> Iterator[Finding]:
+        """
+        分块扫描一段字节数据（bytes / mmap），按偏移顺序产出发现
+
+        每块向前多取 1 字节（判断前一个字符）、向后多取 BLOCK_OVERLAP 字节，
+        只处理起点落在本块内、且不在上一条发现之内的候选，
+        跨块的片段不会被截断或重复，结果与块大小无关。
+        """
+        size = len(buf)
+        covered = 0
+        for s in range(0, size, BLOCK_SIZE):
+            e = min(size, s + BLOCK_SIZE)
+            base = max(0, s - 1)
+            block = buf[base:min(size, e + BLOCK_OVERLAP)]
+            findings = self.scan_block(block, max(s, covered) - base, e - base, base, path)
+            if findings:
+                covered = findings[-1].offset + findings[-1].length
+            yield from findings
+
+    def scan_file(self, path: Path) -> Iterator[Finding]:
+        """以 mmap 映射文件并扫描；空文件直接跳过"""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.stats.files += 1
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from self.scan_buffer(mm, str(path))
+            self.stats.bytes += size
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[Path]:
+    """展开输入路径：文件直接返回，目录递归列出其中的普通文件"""
+    for p in map(Path, paths):
+        if p.is_dir():
+            for root, _, files in os.walk(p):
+                for name in sorted(files):
+                    fp = Path(root) / name
+                    if fp.is_file() and not fp.is_symlink():
+                        yield fp
+        elif p.is_file():
+            yield p
+        else:
+            print(f"[警告] 跳过不存在或非普通文件：{p}")
+
+
+def format_finding(f: Finding, jsonl: bool) -> str:
+    if jsonl:
+        return json.dumps(f._asdict(), ensure_ascii=False) + "\n"
+    return f"{f.path}\t{f.offset}\t{f.length}\t{f.kind}\t{f.value}\t{f.detail}\n"
+
+
+def write_findings(findings: Iterable[Finding], output_file: Path) -> int:
+    """逐条写出发现：.jsonl 后缀输出 JSON Lines，其余输出 TSV；返回条数"""
+    jsonl = output_file.suffix.lower() == ".jsonl"
+    count = 0
+    with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as out:
+        if not jsonl:
+            out.write(RESULT_HEADER)
+        for f in findings:
+            out.write(format_finding(f, jsonl))
+            count += 1
+    return count
+
+
+# ==========================================================
+# 主执行逻辑
+# ==========================================================
+def parse_args():
+    p = argparse.ArgumentParser(description="身份证号 / 银行卡号发现工具（单次扫描）")
+    p.add_argument("paths", nargs="+", help="待扫描的文件或目录（目录递归扫描）")
+    p.add_argument("-o", "--output", default="findings.tsv",
+                   help="发现结果文件，.jsonl 后缀输出 JSON Lines，其余输出 TSV（默认 findings.tsv）")
+    p.add_argument("-r", "--region-file", action="append",
+                   help="行政区码表文件（默认 ID_cards/region_codes.xlsx）；可重复指定多个历史版本")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        scanner = PiiScanner.from_default_tables(args.region_file)
+    except ValueError as e:
+        print(f"[错误] {e}")
+        sys.exit(1)
+    if not scanner.validator.bin_list:
+        print("[错误] BIN 数据加载失败，程序中止")
+        sys.exit(1)
+
+    output_file = Path(args.output)
+    print(f"[信息] 正在扫描并写入结果：{output_file}")
+    start = time.perf_counter()
+
+    def findings():
+        for path in iter_files(args.paths):
+            try:
+                yield from scanner.scan_file(path)
+            except OSError as e:
+                print(f"[警告] 读取失败，已跳过：{path}（{e}）")
+
+    total = write_findings(findings(), output_file)
+    elapsed = time.perf_counter() - start
+    stats = scanner.stats
+    speed = stats.bytes / elapsed / (1 << 20) if elapsed > 0 else 0.0
+    print(f"[完成] 扫描完成！")
+    print(f"    - 文件：{stats.files} 个，{stats.bytes / (1 << 20):.1f} MB，{speed:.1f} MB/秒")
+    print(f"    - 候选片段：{stats.candidates} 个，通过校验位预筛：{stats.prefiltered} 个")
+    print(f"    - 身份证号：{stats.by_kind[KIND_ID]} 条")
+    print(f"    - 银行卡号：{stats.by_kind[KIND_CARD]} 条")
+    print(f"    - 共 {total} 条，结果已保存至：{output_file}")
+
+
+if __name__ == "__main__":
+    main()
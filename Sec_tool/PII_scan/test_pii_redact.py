@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pii_redact 回归测试：分块改写与输出路径检查
+
+运行：python3 -m pytest test_pii_redact.py
+"""
+
+import io
+
+import pytest
+
+import pii_redact
+from pii_scan import KIND_CARD, KIND_ID
+
+
+def redact(scanner, data, chunk_size):
+    maskers = {
+        KIND_CARD: pii_redact.build_masker(pii_redact.DEFAULT_CARD_POLICY, KIND_CARD),
+        KIND_ID: pii_redact.build_masker(pii_redact.DEFAULT_ID_POLICY, KIND_ID),
+    }
+    dst = io.BytesIO()
+    count = pii_redact.Redactor(scanner, maskers, chunk_size).redact_stream(io.BytesIO(data), dst)
+    return dst.getvalue(), count
+
+
+def test_chunk_size_invariance(scanner, corpus):
+    """输出与分块大小无关，且与输入逐字节等长"""
+    expected, count = redact(scanner, corpus, 1 << 20)
+    assert count == len(list(scanner.scan_buffer(corpus)))
+    assert len(expected) == len(corpus)
+    assert b"8848 5647" not in expected
+    for chunk_size in (1, 100, 997):
+        assert redact(scanner, corpus, chunk_size) == (expected, count)
+
+
+def test_nested_out_dir(tmp_path, card):
+    """输出目录不能位于输入目录之内"""
+    src = tmp_path / "logs"
+    src.mkdir()
+    (src / "a.log").write_text(card)
+    assert pii_redact.nested_input_dir([str(src)], str(src / "masked")) == src
+    assert pii_redact.nested_input_dir([str(src)], str(src)) == src
+    assert pii_redact.nested_input_dir([str(src / "a.log")], str(src / "masked")) is None
+    assert pii_redact.nested_input_dir([str(src)], str(tmp_path / "masked")) is None
+
+
+def test_output_collisions(tmp_path, card):
+    """不同输入落到同一输出路径时报错，同一文件重复指定只处理一次"""
+    for sub in ("a", "b", "x/logs", "y/logs"):
+        (tmp_path / sub).mkdir(parents=True)
+        (tmp_path / sub / "log.txt").write_text(card)
+    out = tmp_path / "masked"
+
+    with pytest.raises(ValueError, match="log.txt"):
+        pii_redact.plan_outputs([str(tmp_path / "a/log.txt"), str(tmp_path / "b/log.txt")], None, str(out))
+    with pytest.raises(ValueError, match="logs"):
+        pii_redact.plan_outputs([str(tmp_path / "x/logs"), str(tmp_path / "y/logs")], None, str(out))
+
+    plan = pii_redact.plan_outputs([str(tmp_path / "a/log.txt"), str(tmp_path / "a/log.txt"),
+                                    str(tmp_path / "x/logs")], None, str(out))
+    assert plan == [(tmp_path / "a/log.txt", out / "log.txt"),
+                    (tmp_path / "x/logs/log.txt", out / "logs/log.txt")]
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pii_scan 回归测试：候选片段边界与分块扫描
+
+运行：python3 -m pytest test_pii_scan.py
+"""
+
+import pii_scan
+
+
+def scan(scanner, data):
+    return [(f.offset, f.kind, f.value) for f in scanner.scan_buffer(data)]
+
+
+def test_card_after_rejected_group(scanner, card):
+    """金额后紧跟分组卡号：不合法的候选不能吞掉其中重新开始的卡号"""
+    assert scan(scanner, f"card {card}".encode()) == [(5, "bank_card", card)]
+    assert scan(scanner, f"amount 1000 {card}".encode()) == [(12, "bank_card", card)]
+    assert scan(scanner, f"amount1000 {card}".encode()) == [(11, "bank_card", card)]
+
+
+def test_word_boundary(scanner, card, id_number):
+    """紧跟在字母或数字之后的号码不算候选"""
+    assert scan(scanner, f"x{card}".encode()) == []
+    assert scan(scanner, f"x{id_number}".encode()) == []
+    assert scan(scanner, f"0{id_number}".encode()) == []
+    assert scan(scanner, f"id:{id_number}".encode()) == [(3, "id_card", id_number)]
+
+
+def test_block_size_invariance(scanner, corpus, monkeypatch):
+    """结果与分块大小无关"""
+    expected = scan(scanner, corpus)
+    assert expected
+    for block_size in (97, 1000):
+        monkeypatch.setattr(pii_scan, "BLOCK_SIZE", block_size)
+        assert scan(scanner, corpus) == expected
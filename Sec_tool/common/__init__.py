@@ -0,0 +1 @@
+"""Sec_tool 各工具共用的模块"""
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量检测公共模块（Bank_ID/bank_id.py 与 ID_cards/ID_card.py 共用）
+-----------------------------------------
+功能：
+1. imap_ordered：按输入顺序取回进程池结果，用滑动窗口限制在途任务数
+2. ProgressReporter：按时间间隔输出处理进度和吞吐量
+3. ResultCache：规范化号码 -> 检测结果 的 LRU 去重缓存，可持久化到磁盘；
+   号码的规范化方式和结果的拆分 / 还原由各工具的子类提供
+"""
+
+import abc
+import collections
+import marshal
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 默认进度输出间隔（秒）
+DEFAULT_PROGRESS_INTERVAL = 5.0
+# 去重缓存默认容量（条）
+DEFAULT_DEDUP_SIZE = 1000000
+# 持久化去重缓存的格式版本号
+RESULT_CACHE_VERSION = 1
+
+
+def imap_ordered(pool, func, iterable: Iterable, max_pending: int) -> Iterator:
+    """
+    按输入顺序返回 pool 中 func 的结果，同时最多只有 max_pending 个任务在途
+
+    Pool.imap 会由后台线程一次性把输入全部提交，超大文件会撑爆内存；
+    这里用滑动窗口控制提交速度，保证内存占用有上限。
+    """
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+class ProgressReporter:
+    """按时间间隔输出处理进度和吞吐量，替代逐条打印"""
+
+    def __init__(self, interval: float = DEFAULT_PROGRESS_INTERVAL):
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.done = 0
+
+    def update(self, count: int):
+        self.done += count
+        now = time.perf_counter()
+        if self.interval > 0 and now - self.last >= self.interval:
+            self.last = now
+            print(f"[进度] 已处理 {self.done} 条，{self.rate():.0f} 条/秒", flush=True)
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+class ResultCache(abc.ABC):
+    """
+    规范化号码 -> 检测结果 的 LRU 缓存
+
+    在主进程中使用：split_chunks 把每块中已缓存和块内重复的号码剔除，只把
+    首次出现的号码交给检测函数；join_results 用检测结果更新缓存，并按原始
+    顺序还原整块结果。缓存值不含号码本身，取出时填回本条输入的原始字符串。
+
+    split_chunks 会比 join_results 先行若干块（imap_ordered 的在途窗口），
+    已提交检测、结果尚未取回的号码记在 _inflight 中：后续块再遇到时不重复
+    检测，而是共用同一个结果槽，等前面的块取回结果后一并填入。
+
+    子类需实现 normalize（号码规范化）、to_value（结果 -> 可 marshal 的元组）
+    和 from_value（原始号码 + 缓存值 -> 结果）。
+
+    计数：hits 命中缓存（含检测中的号码），duplicates 块内重复，misses 实际检测。
+    """
+
+    def __init__(self, max_size: int = DEFAULT_DEDUP_SIZE):
+        self.max_size = max(1, max_size)
+        self.entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self.hits = 0
+        self.duplicates = 0
+        self.misses = 0
+        self._pending = collections.deque()
+        # 规范化号码 -> 结果槽（单元素列表），结果取回后填入并移除
+        self._inflight: Dict[str, list] = {}
+
+    @staticmethod
+    @abc.abstractmethod
+    def normalize(raw: str) -> str:
+        """原始号码 -> 去重使用的规范形式"""
+
+    @staticmethod
+    @abc.abstractmethod
+    def to_value(result: Any) -> tuple:
+        """检测结果 -> 不含号码本身、可 marshal 的缓存值"""
+
+    @staticmethod
+    @abc.abstractmethod
+    def from_value(raw: str, value: tuple) -> Any:
+        """原始号码 + 缓存值 -> 检测结果"""
+
+    def get(self, key: str) -> Optional[tuple]:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: tuple):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def split_chunks(self, chunks: Iterable[List[str]]) -> Iterator[List[str]]:
+        """逐块产出需要实际检测的号码（每个规范化号码在块内只出现一次）"""
+        for chunk in chunks:
+            keys = [self.normalize(raw) for raw in chunk]
+            found = {}
+            todo = {}
+            for raw, key in zip(chunk, keys):
+                if key in todo:
+                    self.duplicates += 1
+                elif key in found:
+                    self.hits += 1
+                else:
+                    slot = self._inflight.get(key)
+                    if slot is None:
+                        value = self.get(key)
+                        if value is None:
+                            found[key] = self._inflight[key] = [None]
+                            todo[key] = raw
+                            self.misses += 1
+                            continue
+                        slot = [value]
+                    found[key] = slot
+                    self.hits += 1
+            self._pending.append((chunk, keys, found, list(todo)))
+            yield list(todo.values())
+
+    def join_results(self, result_chunks: Iterable[list]) -> Iterator[list]:
+        """按 split_chunks 的顺序接收检测结果，写入缓存并还原整块结果"""
+        for results in result_chunks:
+            chunk, keys, found, todo_keys = self._pending.popleft()
+            for key, r in zip(todo_keys, results):
+                value = self.to_value(r)
+                found[key][0] = value
+                del self._inflight[key]
+                self.put(key, value)
+            yield [self.from_value(raw, found[key][0]) for raw, key in zip(chunk, keys)]
+
+    def summary(self) -> str:
+        total = self.hits + self.duplicates + self.misses
+        rate = (self.hits + self.duplicates) / total if total else 0.0
+        return (f"命中缓存 {self.hits} 条，块内重复 {self.duplicates} 条，"
+                f"实际检测 {self.misses} 条（去重率 {rate:.1%}）")
+
+    def load(self, path: Path, digest: str) -> int:
+        """读取持久化缓存；数据表哈希不一致或文件损坏时忽略，返回载入条数"""
+        try:
+            cached = marshal.loads(Path(path).read_bytes())
+            if cached.get("version") != RESULT_CACHE_VERSION or cached.get("digest") != digest:
+                return 0
+            entries = cached["entries"]
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, KeyError):
+            return 0
+        # 按从旧到新的顺序保存，超出容量时只保留最近使用的部分
+        for key, value in entries[-self.max_size:]:
+            self.entries[key] = value
+        return len(self.entries)
+
+    def save(self, path: Path, digest: str):
+        """原子写入持久化缓存，写入失败只提示不中断"""
+        payload = {
+            "version": RESULT_CACHE_VERSION,
+            "digest": digest,
+            "entries": list(self.entries.items()),
+        }
+        tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(marshal.dumps(payload))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[警告] 写入去重缓存失败：{e}")
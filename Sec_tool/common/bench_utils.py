@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准公共模块（Bank_ID/bench_bank_id.py 与 ID_cards/bench_id_card.py 共用）
+-----------------------------------------
+功能：
+1. peak_rss_kb：读取峰值常驻内存（KB）
+2. numpy_available：判断 numpy 是否可用（决定是否跳过向量化阶段）
+3. write_corpus：生成（或复用已生成的）语料文件，先写临时文件再原子替换
+4. run_stage_process：在独立子进程（spawn）中运行一个测量阶段并取回结果
+"""
+
+import multiprocessing
+import queue as queue_module
+import resource
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable
+
+# 等待阶段结果时检查子进程是否存活的间隔（秒）
+RESULT_POLL_INTERVAL = 1.0
+# 写语料时每次写入的行数
+CORPUS_WRITE_BATCH = 10000
+
+
+def peak_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+    """峰值常驻内存（KB）；macOS 上 ru_maxrss 单位为字节"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def write_corpus(path: Path, lines: Iterable[str]) -> Path:
+    """把 lines 写入语料文件；文件已存在时直接复用（lines 不会被消费）"""
+    if path.exists():
+        return path
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", buffering=1 << 20) as f:
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= CORPUS_WRITE_BATCH:
+                f.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            f.write("\n".join(batch) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def run_stage_process(stage: str, target: Callable, *args) -> Dict:
+    """
+    在独立子进程（spawn）中运行 target(*args, queue)，隔离峰值内存统计
+
+    target 需把结果字典放入 queue；子进程未返回结果就退出（崩溃、被 OOM
+    终止等）时抛出 RuntimeError，不会无限等待
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=target, args=(*args, queue))
+    proc.start()
+    try:
+        while True:
+            try:
+                return queue.get(timeout=RESULT_POLL_INTERVAL)
+            except queue_module.Empty:
+                if proc.exitcode is None:
+                    continue
+            # 子进程已退出：结果可能刚写入管道，再取一次
+            try:
+                return queue.get(timeout=RESULT_POLL_INTERVAL)
+            except queue_module.Empty:
+                raise RuntimeError(f"阶段 {stage} 的子进程异常退出（退出码 {proc.exitcode}）")
+    finally:
+        proc.join()
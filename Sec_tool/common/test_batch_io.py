@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch_io 回归测试：去重缓存在有在途窗口时仍只检测一次
+
+运行：python3 -m pytest test_batch_io.py
+"""
+
+import pytest
+
+from common import batch_io
+
+
+class UpperCache(batch_io.ResultCache):
+    normalize = staticmethod(str.upper)
+
+    @staticmethod
+    def to_value(result):
+        return (result[1],)
+
+    @staticmethod
+    def from_value(raw, value):
+        return (raw, value[0])
+
+
+def _check(keys, calls):
+    calls.extend(keys)
+    return [(k, len(k)) for k in keys]
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        batch_io.ResultCache()
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_inflight_keys_checked_once(window):
+    """split_chunks 先行 window 块时，窗口内跨块重复的号码也只检测一次"""
+    chunks = [["a", "b", "A"], ["b", "c"], ["B", "a", "d"], ["c", "e"], ["E", "a"]]
+    cache = UpperCache()
+    calls = []
+
+    todo = cache.split_chunks(chunks)
+    submitted = []
+    joined = []
+    results = iter(submitted)
+    out = cache.join_results(results)
+    for keys in todo:
+        submitted.append(_check(keys, calls))
+        if len(submitted) - len(joined) >= window:
+            joined.append(next(out))
+    joined.extend(out)
+
+    assert joined == [[(raw, 1) for raw in chunk] for chunk in chunks]
+    assert sorted(calls) == ["a", "b", "c", "d", "e"]
+    assert cache.misses == 5
+    assert cache.hits + cache.duplicates + cache.misses == sum(map(len, chunks))
+    assert not cache._inflight